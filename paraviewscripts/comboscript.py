@@ -97,6 +97,7 @@ pl_xlist = [2]       # positions at which to collect the trace, in nozzle inner
 pl_zlist = []
 
 pl_forceOverwrite = False # True to overwrite existing files
+pl_processes = 1        # number of pvpython processes to collect line traces with at once
 
 #----------------------------------
 
@@ -134,18 +135,20 @@ folders = filterSimNums(topfolders, nlist)
 #for s in ['shearStressNozx', 'shearStressx', 'shearStressy', 'shearRateNozx', 'viscNozx']:
 
 
-def runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xlist, pl_zlist, pl_tlist, csvTimes, nozTimes, pl_forceOverwrite, looping, loopTime):
+def runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xlist, pl_zlist, pl_tlist, csvTimes, nozTimes, pl_forceOverwrite, looping, loopTime, pl_processes=1):
     logging.info('Exporting images and csvs.')
     logging.info(f'Images. Overwrite: {ss_forceOverwrite}')
     for r in runList:
         logging.info(r.prnt())
     logging.info(f'Interface CSVs: Collect: {getCSVs}. Overwrite: {forceOverwrite}')
     logging.info(f'Nozzle CSVs: Collect: {getNoz}. Overwrite: {forceOverwrite}')
-    logging.info(f'Folders: {[os.path.basename(f) for f in folders]}')
-    logging.info(f'Line traces:\n\
-                X positions: {pl_xlist} di behind nozzle.\n\
-                Z positions: {pl_zlist} di above nozzle bottom.\n\
-                Time list: {pl_tlist} s.')
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        # only build the list of folder names if it will be logged
+        logging.info(f'Folders: {[os.path.basename(f) for f in folders]}')
+    logging.info('Line traces:\n\
+                X positions: %s di behind nozzle.\n\
+                Z positions: %s di above nozzle bottom.\n\
+                Time list: %s s.', pl_xlist, pl_zlist, pl_tlist)
 
     while True:
 
@@ -164,11 +167,9 @@ def runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xl
                 #         if unabridged[i]==folder:
                 #             dest = os.path.join(afold,'images',os.path.basename(folder)+'_t025_x_alphaSlice_1.4.png')
                 #             shutil.copy(fromm, dest)
-            if getLine:
-                for xpos in pl_xlist:
-                    pl.csvfolder(folder, 'x', xpos, pl_tlist, forceOverwrite=pl_forceOverwrite) # line trace at constant x
-                for zpos in pl_zlist:
-                    pl.csvfolder(folder, 'z', zpos, pl_tlist, forceOverwrite=pl_forceOverwrite) # line trace at constant z
+        if getLine:
+            # line traces at constant x and constant z, split across processes
+            pl.csvfolders(folders, pl_xlist, pl_zlist, pl_tlist, forceOverwrite=pl_forceOverwrite, processes=pl_processes)
         if not looping:
             break
         now = datetime.now()
@@ -179,6 +180,8 @@ def runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xl
         
  
     
-runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xlist, pl_zlist, pl_tlist, csvTimes, nozTimes, pl_forceOverwrite, looping, loopTime)
+if __name__=='__main__':
+    # guarded so that line trace worker processes can import this script without running it
+    runItAll(runList, ss_forceOverwrite, getCSVs, forceOverwrite, folders, pl_xlist, pl_zlist, pl_tlist, csvTimes, nozTimes, pl_forceOverwrite, looping, loopTime, pl_processes=pl_processes)
 
         
\ No newline at end of file
@@ -31,6 +31,8 @@ logger = logging.getLogger(__name__)
 
 #################################################################
 
+SIMNUMRE = re.compile(r'[0-9]+') # first run of digits in a folder name
+
 def isNum(s:str) -> bool:
     '''check if the character is a number'''
     if s in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']:
@@ -40,33 +42,34 @@ def isNum(s:str) -> bool:
 
 def simNum(f:str) -> int:
     '''extract the simulation number from the folder'''
-    i = 0
-    while i<len(f) and not isNum(f[i]):
-        i+=1
-    j = i
-    while j<len(f) and isNum(f[j]):
-        j+=1
-    if i==j: # no number RG
+    m = SIMNUMRE.search(f)
+    if m is None: # no number RG
         return -100
-    return int(f[i:j])
+    return int(m.group(0))
 
 
 def filterSimNums(topfolders:List[str], nlist:List[int]) -> List[str]:
-    '''get a list of folders that have sim numbers in the list'''
+    '''get a list of folders that have sim numbers in the list. 
+    Folder names are checked against the list before the folders are checked for case files'''
+    nset = set(nlist)
     folders = []
     for topfolder in topfolders:
-        for f in fh.simFolders(topfolder):
-            if simNum(os.path.basename(f)) in nlist:
-                folders.append(f)
+        flist = []
+        with os.scandir(topfolder) as it:
+            for entry in it:
+                if entry.is_dir() and simNum(entry.name) in nset and fh.folderHandler(entry.path).isSimFolder():
+                    flist.append(entry.path)
+        flist.sort(key=lambda x: int(os.path.basename(x)[2:]))
+        folders = folders+flist
     return folders
 
 def extractCorNums(topfolders:List[str], dirs:List[str], nlist:List[str]) -> Union[List[str],List[str]]: # RG
     '''get a list of folders corresponding to sims in the list'''
     nb = []
-    nlist = [simNum(os.path.basename(n)) for n in nlist]
+    nset = set([simNum(os.path.basename(n)) for n in nlist])
     for topfolder in topfolders:
         for f in fh.simFolders(topfolder):
-            if simNum(os.path.basename(f))!=-100 and simNum(os.path.basename(f)) in nlist:
+            if simNum(os.path.basename(f))!=-100 and simNum(os.path.basename(f)) in nset:
                 geo = os.path.join(f,'geometry.csv')
                 with open(geo, "r") as g:
                     data = list(csv.reader(g))
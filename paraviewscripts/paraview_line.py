@@ -5,6 +5,7 @@
 import os
 import logging
 import csv
+import multiprocessing
 from paraview.simple import * # import the simple module from the paraview
 
 # local packages
@@ -26,13 +27,14 @@ logger.setLevel(logging.DEBUG)
 
 #----------------------------------------------------------------
 
-def initializeAll(folder:str, constDir:str, pos:float):
-    '''initialize all of paraview. constDir is direction that has const value ('x' or 'z'). pos is the value that stays constant, in x or z (e.g. -0.001)'''
+def initializeAll(folder:str, constDir:str, pos:float, fs:folderStats=None):
+    '''initialize all of paraview. constDir is direction that has const value ('x' or 'z'). pos is the value that stays constant, in x or z (e.g. -0.001). fs is the folderStats object for the folder, if it has already been created'''
     print('Folder ', folder)
     print(' Initializing paraview ')
     sv = stateVars(folder)        # make subdirectories
     sv =  initializeP(sv)        # initialize Paraview
-    fs = folderStats(folder)
+    if fs is None:
+        fs = folderStats(folder)
 
     if constDir=='x':
         btc = fs.geo.btc/1000 * 0.97
@@ -132,7 +134,7 @@ def csvfolder(folder:str, constDir:str, pos:float, tlist:List[float], forceOverw
                         if not initialized: # if paraview hasn't already been initialized, initialize it
                             fs = folderStats(folder)
                             posabs = (fs.geo.nozzle_center_x_coord + pos*fs.geo.nozzle_inner_width)/1000
-                            sv = initializeAll(folder, constDir, posabs)
+                            sv = initializeAll(folder, constDir, posabs, fs=fs)
                             sv.times = times
                             initialized = True
                         setTime(time, sv) 
@@ -147,4 +149,26 @@ def csvfolder(folder:str, constDir:str, pos:float, tlist:List[float], forceOverw
                 del sv
             except:
                 return
-    return
\ No newline at end of file
+    return
+
+
+def csvfolderTask(task:Tuple[str, str, float, List[float], bool]) -> None:
+    '''Export one line trace. task is (folder, constDir, pos, tlist, forceOverwrite), as described in csvfolder'''
+    folder, constDir, pos, tlist, forceOverwrite = task
+    csvfolder(folder, constDir, pos, tlist, forceOverwrite=forceOverwrite)
+    
+
+def csvfolders(folders:List[str], xlist:List[float], zlist:List[float], tlist:List[float], forceOverwrite:bool=False, processes:int=1) -> None:
+    '''Export line traces for all folders, at constant x for each position in xlist and at constant z for each position in zlist. 
+    Positions are relative to the nozzle center, in nozzle inner widths.
+    processes is the number of pvpython processes to run at once. Each folder is an independent simulation, so traces can be collected in parallel'''
+    tasks = []
+    for folder in folders:
+        tasks = tasks + [(folder, 'x', xpos, tlist, forceOverwrite) for xpos in xlist]
+        tasks = tasks + [(folder, 'z', zpos, tlist, forceOverwrite) for zpos in zlist]
+    if processes>1 and len(tasks)>1:
+        with multiprocessing.Pool(processes) as pool:
+            pool.map(csvfolderTask, tasks, chunksize=1)
+    else:
+        for task in tasks:
+            csvfolderTask(task)
@@ -23,6 +23,7 @@ from folder_stats import folderStats
 
 #-------------------------------------------------------------------------------------------------  
 
+ENDTIMERE = re.compile(r'^endTime.*$', re.M) # endTime line in a controlDict
     
 def mkdirif(path:str) -> int:
     '''make a directory if it doesn't exist
@@ -63,31 +64,20 @@ def modifyControlDict(folder:str, tend:float) -> int:
     else:
         cf = folder
     cdfile = os.path.join(cf, 'system', 'controlDict')
-    cdfilenew = os.path.join(cf, 'system', 'controlDict2')
     if not os.path.exists(cdfile):
         return 1
-    retval = 0
-    # if the endtime is already at the value, abort this loop and delete the new file
-    with open(cdfile, 'r') as fold:
-        with open(cdfilenew, 'w') as fnew:
-            for line in fold:
-                if line.startswith('endTime'):
-                    linenew = 'endTime\t'+str(tend)+';\n'
-                    if linenew==line:
-                        retval = 1
-                        break
-                    else:
-                        line = linenew
-                fnew.write(line)
-                
-    # if we changed the endtime, overwrite the old file
-    if retval==0:            
-        os.remove(cdfile)
-        os.rename(cdfilenew, cdfile)
-        print('Set end time to '+str(tend)+' in '+cdfile)
-    else:
-        os.remove(cdfilenew)
-    return retval
+    with open(cdfile, 'r') as f:
+        text = f.read()
+    textnew = ENDTIMERE.sub(f'endTime\t{tend};', text, count=1)
+    if textnew==text:
+        # the endtime is already at the value
+        return 1
+    
+    # we changed the endtime, so overwrite the old file
+    with open(cdfile, 'w') as f:
+        f.write(textnew)
+    print('Set end time to '+str(tend)+' in '+cdfile)
+    return 0
 
     
     
@@ -10,6 +10,40 @@ import os
 
 #-------------------------
 
+TAILCHUNK = 1<<12 # bytes to read from the end of a file in fileTail
+
+def fileTail(filename:str, chunk:int=TAILCHUNK) -> bytes:
+    '''Read the last chunk bytes of a file in one read and return the complete lines in them, as bytes. 
+    If the chunk doesn't start at the beginning of the file, the first line might be cut off, so it is dropped'''
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        f.seek(max(0, size-chunk))
+        data = f.read()
+    if size>chunk:
+        data = data[data.find(b'\n')+1:]
+    return data
+
+def rfindLine(data:bytes, prefix:bytes, end:int=-1) -> int:
+    '''Find the start of the last line that starts with prefix and starts before index end. 
+    data is the contents of a file as bytes or a mmap. If end is -1, search the whole file.
+    Returns -1 if there is no such line'''
+    if end<0:
+        end = len(data)
+    i = data.rfind(b'\n'+prefix, 0, end)
+    if i>=0:
+        return i+1
+    if end>0 and data[:len(prefix)]==prefix:
+        # first line of the file
+        return 0
+    return -1
+
+def lineAt(data:bytes, i:int) -> str:
+    '''Get the line that starts at index i in data, which is the contents of a file as bytes or a mmap'''
+    j = data.find(b'\n', i)
+    if j<0:
+        j = len(data)
+    return data[i:j].decode('utf-8', 'replace')
+
 def fileReadBackwards(filename:str, buf_size=8192):
     """A generator that returns the lines of a file in reverse order. Encoding is not used, but makes this interchangeable with file_read_backwards"""
     with open(filename) as fh:
@@ -14,6 +14,8 @@ import csv
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+WRITEBUFFER = 1<<20 # buffer size in bytes for exported text files and csvs
+
 #----------------------------------------------
 
 def plainImDict(fn:str, unitCol:int=-1, valCol:Union[int,list]=1) -> Tuple[dict,dict]:
@@ -65,9 +67,8 @@ def exportFile(folder:str, file:str, text:str) -> None:
     file is a file base name (e.g. 'myfile.txt') within that folder
     text is the text to write to the file'''
     fn = os.path.join(folder, file)
-    File_object = open(fn,"w")
-    File_object.write(text)
-    File_object.close()
+    with open(fn, 'w', buffering=WRITEBUFFER) as File_object:
+        File_object.write(text)
     logging.info("Exported file %s" % fn)
 
 
@@ -75,9 +76,8 @@ def exportCSV(fn:str, table:List[Any]) -> None:
     '''exportCSV exports a csv file
     fn is the full path of the file to export
     table is the table to export, as a list'''
-    with open(fn, mode='w', newline='') as f:
+    with open(fn, mode='w', newline='', buffering=WRITEBUFFER) as f:
         w = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        for i in table:
-            w.writerow(i)
+        w.writerows(table)
     logging.info('Exported file %s' % fn)
     
\ No newline at end of file
@@ -22,6 +22,33 @@ from file_export import *
 
 #--------------------
 
+# folder label from the DataSet line, and time from the line after TimeValue, in a .vtm file
+VTMRE = re.compile(r'DataSet name=[^\n_]*_([^\n_]*?)(?:_|/internal).*?TimeValue[^\n]*\n([^\n]*)', re.S)
+# time in each entry of a .series file, read in binary
+SERIESTIMERE = re.compile(rb'"time"\s*:\s*([-\d.eE+]+)')
+# splits a .vtk file name into the case name and folder label
+VTKSPLIT = re.compile(r'_|\.v')
+
+# case and VTK folders that have already been found, shared between folderHandlers
+SHAREDPATHS = ['caseFold', 'VTKFold']
+_pathCache:Dict[Tuple[str,str], str] = {}
+
+# times found by folderHandler.times, keyed by folder. values are (modification times when the times were found, times)
+_timesCache:Dict[str, Tuple[Tuple[float, float, float], List[float]]] = {}
+
+# folderStates found by folderHandler.state, keyed by folder
+_stateCache:Dict[str, 'folderState'] = {}
+
+def mtime(file:str) -> float:
+    '''get the modification time of the file or folder, or 0 if it does not exist'''
+    if len(file)==0 or not os.path.exists(file):
+        return 0
+    return os.path.getmtime(file)
+
+def clearPathCache() -> None:
+    '''forget all case and VTK folders found so far, e.g. after moving simulation folders'''
+    _pathCache.clear()
+
 
 def simFolders(folder:str) -> list:
     '''list all case folders in the folder
@@ -35,15 +62,55 @@ def simFolders(folder:str) -> list:
     else:
         # find all sim folders in this folder
         flist = []
-        for f in os.listdir(folder):
-            fold = os.path.join(folder,f)
-            fh = folderHandler(fold)
-            if fh.isSimFolder():
-                flist.append(fold)
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir() and folderHandler(entry.path).isSimFolder():
+                    flist.append(entry.path)
         flist.sort(key=lambda x: int(os.path.basename(x)[2:]))
         return flist
     
 
+class folderState:
+    '''Contents of the case and VTK folders of a simulation, collected in one scan of each folder. 
+    key is the modification times of the case and VTK folders when they were scanned. 
+    Use folderHandler.state() to get one that is up to date'''
+    
+    def __init__(self, caseFolder:str, vtkFolder:str, key:Tuple[float, float]):
+        self.caseFolder = caseFolder
+        self.vtkFolder = vtkFolder
+        self.key = key
+        self.folderTimes = []   # times from OpenFOAM time folders, e.g. "0.1"
+        self.seriesFile = ''    # .vtm.series or .vtk.series file
+        self.vtkCount = 0       # number of .vtk and .vtm files
+        self.scanCase()
+        self.scanVTK()
+        
+    def scanCase(self) -> None:
+        '''find the OpenFOAM time folders in the case folder'''
+        if len(self.caseFolder)==0 or not os.path.exists(self.caseFolder):
+            return
+        with os.scandir(self.caseFolder) as it:
+            for entry in it:
+                try:
+                    s0 = float(entry.name)
+                except:
+                    pass
+                else:
+                    self.folderTimes.append(s0)
+                    
+    def scanVTK(self) -> None:
+        '''find the series file and count the .vtk and .vtm files in the VTK folder'''
+        if len(self.vtkFolder)==0 or not os.path.exists(self.vtkFolder):
+            return
+        with os.scandir(self.vtkFolder) as it:
+            for entry in it:
+                if '.series' in entry.name:
+                    if len(self.seriesFile)==0:
+                        self.seriesFile = entry.path
+                elif entry.name.endswith(('.vtk', '.vtm')):
+                    self.vtkCount+=1
+    
+
 class folderHandler:
     '''for finding files within a simulation folder'''
     
@@ -61,16 +128,20 @@ class folderHandler:
         for true, input folder should be a simulation folder, e.g. "C:\\...\\nb30"'''
         if os.path.basename(self.folder)=='mesh':
             return False
-        cf = self.caseFolder()
-        if not os.path.exists(cf):
-            return False
-        else:
-            return True
+        return len(self.caseFolder())>0
         
     def setAndReturn(self, name:str, s:str) -> str:
         '''set the stored value of name to s, and return s'''
         setattr(self, name, s)
+        if name in SHAREDPATHS and len(s)>0:
+            _pathCache[(self.folder, name)] = s
         return s
+    
+    def stored(self, name:str) -> str:
+        '''get the stored value of name, either from this object or from another folderHandler for the same folder. returns empty string if nothing is stored'''
+        if hasattr(self, name):
+            return getattr(self, name)
+        return _pathCache.get((self.folder, name), '')
 
     def setCaseFold(self, s:str) -> str:
         '''set the case folder to this value and return'''
@@ -80,8 +151,9 @@ class folderHandler:
         '''find the path of the folder with the case files (e.g. constant, system, 0)
         input folder should be a simulation folder, e.g. "C:\\...\\nb30" '''
         # if there is a folder in this folder named 'case', return that folder
-        if hasattr(self, 'caseFold'):
-            return self.caseFold
+        cf = self.stored('caseFold')
+        if len(cf)>0:
+            return cf
         casefold = os.path.join(self.folder, 'case')
         if os.path.exists(casefold):
             return self.setCaseFold(casefold)
@@ -97,7 +169,7 @@ class folderHandler:
             return self.setCaseFold(self.folder)
         legfold = os.path.join(self.folder, 'legend.csv')
         if os.path.exists(legfold):
-            return self.setCaseFold(folder)
+            return self.setCaseFold(self.folder)
         else:
             return ''
         
@@ -113,15 +185,16 @@ class folderHandler:
         # if there is a folder in the parent folder called 'mesh', return that folder
         mf = os.path.join(os.path.dirname(self.folder), 'mesh')
         if os.path.exists(mf):
-            return self.setAndReturn('caseFold', mf)
+            return self.setAndReturn('meshFold', mf)
         else:
             return ''
         
     def VTKFolder(self) -> str:
         '''Find the path of the VTK folder .
         Input folder should be a simulation folder, e.g. "C:\\...\\nb30"'''
-        if hasattr(self, 'VTKFold'):
-            return self.VTKFold
+        vf = self.stored('VTKFold')
+        if len(vf)>0:
+            return vf
         
         if not os.path.exists(self.folder):
             raise Exception('Folder does not exist')
@@ -149,9 +222,9 @@ class folderHandler:
         if not os.path.exists(vtkfolder):
             return ''
 
-        for file in os.listdir(vtkfolder):
-            if '.series' in file:
-                return self.setAndReturn('seriesFile', os.path.join(vtkfolder, file))
+        seriesfile = self.scanVTKFolder()[0]
+        if len(seriesfile)>0:
+            return seriesfile
                 
         # if there is a vtk folder but no series file, generate one
         if loop:
@@ -161,61 +234,40 @@ class folderHandler:
             return ''
         
         
-    def correctVTM(self, file:str) -> None:
-        '''Sometimes the t=0 vtm file gets saved with the wrong time. This fixes the file. File should be a .vtm file'''
-        folderlabel = ""
-        time = ""
-        st = ''
-        if not os.path.exists(file):
-            return
-        with open(file, 'r') as f:
-            line = f.readline()
-            st = f'{st}{line}'
-            while not ('DataSet name=' in line) and len(line)>0:
-                line = f.readline()
-                st = f'{st}{line}'
-            if len(line)>0:
-                strs = re.split('_|/internal', line)
-                folderlabel = strs[1]
-            while not ('TimeValue' in line) and len(line)>0:
-                line = f.readline()
-                st = f'{st}{line}'
-            if len(line)>0:
-                line = f.readline()
-                time = line.replace('\n','')
-                if folderlabel=='0' and not time=='0':
-                    st = f'{st}0\n'
-                else:
-                    st = f'{st}{line}'
-            while len(line)>0:
-                line = f.readline()
-                st = f'{st}{line}'
+    def correctVTM(self, file:str, st:str='') -> None:
+        '''Sometimes the t=0 vtm file gets saved with the wrong time. This fixes the file. File should be a .vtm file. 
+        st is the text of the file, if it has already been read'''
+        if len(st)==0:
+            if not os.path.exists(file):
+                return
+            with open(file, 'r') as f:
+                st = f.read()
+        m = VTMRE.search(st)
+        if m is not None and m.group(1)=='0' and not m.group(2)=='0':
+            st = ''.join([st[:m.start(2)], '0', st[m.end(2):]])
         exportFile(os.path.dirname(file), os.path.basename(file), st)
 
 
-    def readVTM(self, file:str) -> Tuple[str, str]:
+    def parseVTM(self, st:str) -> Tuple[str, str]:
+        '''Find the vtk folder name and corresponding time in the text of a vtm file'''
+        m = VTMRE.search(st)
+        if m is None:
+            return "", ""
+        return m.group(1), m.group(2)
+
+
+    def readVTM(self, file:str) -> Tuple[str, str, str]:
         '''Find the vtk folder name and corresponding time for a vtm file
-        File should be a .vtm file'''
-        folderlabel = ""
-        time = ""
+        File should be a .vtm file. 
+        If the file is a t=0 file saved with the wrong time, also returns the text of the file, which should be fixed with correctVTM. Otherwise, the third value is empty'''
         if not os.path.exists(file):
-            return folderlabel, time
+            return "", "", ""
         with open(file, 'r') as f:
-            line = f.readline()
-            while not ('DataSet name=' in line) and len(line)>0:
-                line = f.readline()
-            if len(line)>0:
-                strs = re.split('_|/internal', line)
-                folderlabel = strs[1]
-            while not ('TimeValue' in line) and len(line)>0:
-                line = f.readline()
-            if len(line)>0:
-                line = f.readline()
-                time = line.replace('\n','')
+            st = f.read()
+        folderlabel, time = self.parseVTM(st)
         if folderlabel=='0' and not time=='0':
-            self.correctVTM(file)
-            time = '0'
-        return folderlabel, time
+            return folderlabel, '0', st
+        return folderlabel, time, ""
 
 
     def generateVTKSeries(self, tlist:List[str], flist:List[str], ending:str, lastTime:float=0) -> None:
@@ -233,26 +285,19 @@ class folderHandler:
                 print(seriesTime, lastTime)
                 return
             cfbasename = os.path.basename(seriesfile).replace(ending+'.series', '') # e.g. 'case'
+            vtkfolder = os.path.dirname(seriesfile)
         else:
             cf = self.caseFolder()
             cfbasename = os.path.basename(cf) # e.g. 'case' or 'nb64'
+            vtkfolder = os.path.join(cf, 'VTK')
         if len(tlist)==0 or len(flist)==0 or not len(tlist)==len(flist):
             return
-        l = (np.array([tlist, flist])).transpose() # this creates a combined time and folder name table
-        l = l[np.argsort(l[:,0])]    # this sorts the time and folder name table by time
+        order = np.argsort(np.array(tlist, dtype=float), kind='stable')    # sort the folder names by time, numerically
 
-        # generate file
-        st = '{\n  \"file-series-version\" : \"1.0\",\n  \"files\" : [\n' # opening line
-        for time, folderlabel in l[0:-1]:
-            st = st + '    { \"name\" : \"' + cfbasename + '_' + folderlabel
-            st = st + ending + '\", \"time\" : ' + time + ' },\n' 
-            # each vtk file gets a row in the file
-        st = st + '    { \"name\" : \"' + cfbasename + '_' + l[-1,1]
-        st = st + ending + '\", \"time\" : ' + l[-1,0] + ' }\n' 
-            # last line contains no comma at the end
-        st = st + '  ]\n}' 
-            # closing line
-        exportFile(os.path.join(cf, 'VTK'), f'{cfbasename}{ending}.series', st)
+        # generate file. each vtk file gets a row in the file, and the last row has no comma at the end
+        rows = [f'    {{ \"name\" : \"{cfbasename}_{flist[i]}{ending}\", \"time\" : {tlist[i]} }}' for i in order]
+        st = '{\n  \"file-series-version\" : \"1.0\",\n  \"files\" : [\n' + ',\n'.join(rows) + '\n  ]\n}'
+        exportFile(vtkfolder, f'{cfbasename}{ending}.series', st)
         return
 
 
@@ -270,62 +315,82 @@ class folderHandler:
         tlist = [] # times
         ending = '.vtm'
         lastTime = 0
-        for file in os.listdir(vtkfolder):
-            ffull = os.path.join(vtkfolder, file)
-            if file.endswith('.vtm'):
-                updatedTime = os.path.getmtime(ffull)
-                if updatedTime>lastTime:
-                    lastTime=updatedTime
-                flabel, time = self.readVTM(ffull)
-                if len(flabel)>0 and len(time)>0:
-                    flist.append(flabel)
-                    tlist.append(time)
-            elif file.endswith('.vtk'):
-                updatedTime = os.path.getmtime(ffull)
+        toCorrect = [] # vtm files with the wrong time, and their text
+        with os.scandir(vtkfolder) as it:
+            for entry in it:
+                file = entry.name
+                if not file.endswith(('.vtm', '.vtk')):
+                    continue
+                # one stat per file. DirEntry caches it, and on Windows it comes with the directory listing
+                updatedTime = entry.stat().st_mtime
                 if updatedTime>lastTime:
                     lastTime=updatedTime
-                ending = '.vtk'
-                flabel = int(re.split('\_|.v', file)[1])
-                flist.append(flabel)
-                if len(tlist)==0:
-                    tlist.append(0)
+                if file.endswith('.vtm'):
+                    flabel, time, wrongTime = self.readVTM(entry.path)
+                    if len(wrongTime)>0:
+                        toCorrect.append((entry.path, wrongTime))
+                    if len(flabel)>0 and len(time)>0:
+                        flist.append(flabel)
+                        tlist.append(time)
                 else:
-                    tlist.append(tlist[-1]+0.1)   
+                    ending = '.vtk'
+                    flabel = int(VTKSPLIT.split(file)[1])
+                    flist.append(flabel)
+                    if len(tlist)==0:
+                        tlist.append(0)
+                    else:
+                        tlist.append(tlist[-1]+0.1)   
+        for file, st in toCorrect:
+            self.correctVTM(file, st=st)
         if ending=='.vtk':
             flist.sort()
             flist = [str(f) for f in flist]
             tlist = ['{:1.1f}'.format(t) for t in tlist]
 
         self.generateVTKSeries(tlist, flist, ending, lastTime=lastTime)
+        self.forgetState()   # the VTK folder may have a new series file
         return
     
     #----------------------------------------
     
+    def state(self) -> folderState:
+        '''get the contents of the case and VTK folders. The folders are only scanned again if they have changed since the last scan'''
+        cf = self.caseFolder()
+        vf = self.VTKFolder()
+        key = (mtime(cf), mtime(vf))
+        if not self.folder in _stateCache or not _stateCache[self.folder].key==key:
+            _stateCache[self.folder] = folderState(cf, vf, key)
+        return _stateCache[self.folder]
+    
+    def forgetState(self) -> None:
+        '''scan the case and VTK folders again the next time they are needed'''
+        _stateCache.pop(self.folder, None)
+    
+    def scanVTKFolder(self) -> Tuple[str, int]:
+        '''Find the .series file and count the .vtk and .vtm files in the VTK folder.
+        Returns empty string for the series file if there is none'''
+        st = self.state()
+        if len(st.seriesFile)>0:
+            self.setAndReturn('seriesFile', st.seriesFile)
+        return st.seriesFile, st.vtkCount
+    
     def vtkFiles(self) -> int:
         '''Determine how many .vtk or .vtm files there are. 
         Input folder should be a simulation folder, e.g. "C:\\...\\nb30"'''
-        vtkfolder = self.VTKFolder()
-        if not os.path.exists(vtkfolder):
-            return 0
-        num = 0
-        for file in os.listdir(vtkfolder):
-            if file.endswith('.vtk') or file.endswith('.vtm'):
-                num+=1
-        return num
+        return self.scanVTKFolder()[1]
 
 
     def parseVTKSeries(self) -> List[float]:
         '''parseVTKSeries extracts a list of times from the .vtm.series files
         folder is a full file name that can point to the case folder or the folder above it
         input folder should be a simulation folder, e.g. "C:\\...\\nb30" or "C:\\...\\nb30\\case"'''
-        seriesfile = self.series()
+        seriesfile, numvtkFiles = self.scanVTKFolder()
+        if len(seriesfile)==0:
+            seriesfile = self.series()
         times = []
         if os.path.exists(seriesfile):
-            with open(seriesfile, 'r') as f:
-                for line in f:
-                    if 'name' in line:
-                        times.append(float(re.split('time\" : | }', line)[1]))
-        numvtkFiles = self.vtkFiles()
+            with open(seriesfile, 'rb') as f:
+                times = [float(t) for t in SERIESTIMERE.findall(f.read())]
         if len(times)<numvtkFiles:
             self.redoVTKSeriesNoLog()
         return times
@@ -337,25 +402,22 @@ class folderHandler:
         '''get a list of times simulated in the folder
             input folder should be a simulation folder, e.g. "C:\\...\\nb30"
             this will only tell you about OpenFOAM folders, e.g. "0.1".'''
-        ff = os.listdir(self.caseFolder())
-        slist = []
-        for i in ff:
-            try:
-                s0 = float(i)
-            except:
-                pass
-            else:
-                slist.append(s0)
-        return slist
+        return list(self.state().folderTimes)
 
 
     def times(self) -> List[float]:
         '''Get a list of simulated times. 
         Input folder should be a simulation folder, e.g. "C:\\...\\nb30"
-        This gets the list of times from the vtk file and from the list of files in the folder. If the vtk file has fewer times, the folder list is returned. The vtk list is not updated because we might be in the middle of a run, in which case there will be more folders than vtm files. If the vtk file has more or the same amount of times, the vtk list is returned. If neither has any times, the vtk file gets updated and the new list from the vtk file is returned'''
+        This gets the list of times from the vtk file and from the list of files in the folder. If the vtk file has fewer times, the folder list is returned. The vtk list is not updated because we might be in the middle of a run, in which case there will be more folders than vtm files. If the vtk file has more or the same amount of times, the vtk list is returned. If neither has any times, the vtk file gets updated and the new list from the vtk file is returned.
+        The list is reused until the case folder, VTK folder, or series file is modified'''
+        key = (mtime(self.caseFolder()), mtime(self.VTKFolder()), mtime(self.series(loop=False)))
+        if self.folder in _timesCache and _timesCache[self.folder][0]==key:
+            return list(_timesCache[self.folder][1])
         t1 = self.timesFromFolder()
         t2 = self.parseVTKSeries()
         if len(t1)>len(t2):
-            return t1
+            t = t1
         else:
-            return t2
\ No newline at end of file
+            t = t2
+        _timesCache[self.folder] = (key, list(t))
+        return t
\ No newline at end of file
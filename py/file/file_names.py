@@ -26,6 +26,21 @@ logger.setLevel(logging.DEBUG)
 
 #################################################################
 
+# png file names in each export folder, keyed by folder, stored as (folder modification time, names)
+_pngCache:Dict[str, Tuple[float, set]] = {}
+
+def existingPngs(folder:str) -> set:
+    '''get the names of the png files in the folder. the folder is only re-read if it has changed since the last call'''
+    if len(folder)==0:
+        folder = '.'     # file names without a folder are in the working directory
+    if not os.path.isdir(folder):
+        return set()
+    mt = os.path.getmtime(folder)
+    if not folder in _pngCache or not _pngCache[folder][0]==mt:
+        with os.scandir(folder) as it:
+            _pngCache[folder] = (mt, {e.name for e in it if e.name.endswith('.png')})
+    return _pngCache[folder][1]
+
 
 class fnCreator:
     '''Construct an image file name with no extension. 
@@ -85,7 +100,7 @@ class fnCreator:
         '''add a variable definition to the name'''
         if key in ['adjustBounds'
                    , 'cname', 'colorDict', 'colorList', 'crops'
-                   , 'display','dispUnits'
+                   , 'display','dispUnits', 'dpi'
                    , 'ef', 'eps', 'export'
                    , 'gridlines'
                    , 'horizLabels'
@@ -138,32 +153,33 @@ class fnCreator:
     def png(self):
         return f'{self.fn}.png'
     
+    def pngExists(self) -> bool:
+        '''check if the png has already been exported'''
+        return os.path.basename(self.png()) in existingPngs(os.path.dirname(self.fn))
+    
     def svg(self):
         return f'{self.fn}.svg'
     
     def eps(self):
         return f'{self.fn}.eps'
     
-    def saveFig(self, fig, fn:str) -> None:
-        fig.savefig(fn, bbox_inches='tight', dpi=300, transparent=True)
+    def saveFig(self, fig, fn:str, dpi:int=300) -> None:
+        fig.savefig(fn, bbox_inches='tight', dpi=dpi, transparent=True)
     
-    def export(self, fig, svg:bool=True, png:bool=True, eps:bool=False, **kwargs):
-        '''export the png and/or svg'''
+    def export(self, fig, svg:bool=True, png:bool=True, eps:bool=False, dpi:int=300, **kwargs):
+        '''export the png and/or svg. use a lower dpi for quick drafts'''
         if not png and not svg:
             return
-        create = self.fn
-        clist = []
-        while not os.path.exists(os.path.dirname(create)):
-            clist.append(os.path.basename(create))
-            create = os.path.dirname(create)
-        while len(clist)>0:
-            os.mkdir(create)
-            logging.info(f'Created directory {create}')
-            create = os.path.join(create, clist.pop(-1))
+        folder = os.path.dirname(self.fn) or '.'
+        if not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+            logging.info(f'Created directory {folder}')
         if svg:
-            self.saveFig(fig, self.svg())
+            self.saveFig(fig, self.svg(), dpi=dpi)
         if png:
-            self.saveFig(fig, self.png())
+            self.saveFig(fig, self.png(), dpi=dpi)
+            if folder in _pngCache:
+                _pngCache[folder][1].add(os.path.basename(self.png()))
         if eps:
-            self.saveFig(fig, self.eps())
+            self.saveFig(fig, self.eps(), dpi=dpi)
         logging.info(f'Exported {self.fn}')
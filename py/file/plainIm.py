@@ -20,11 +20,12 @@ logger.setLevel(logging.DEBUG)
 
 #----------------------------------------------
 
-def plainIm(file:str, ic:Union[int, bool]=0, checkUnits:bool=True) -> Tuple[Union[pd.DataFrame, List[Any]], Dict]:
-    '''import a csv to a pandas dataframe. ic is the index column. Int if there is an index column, False if there is none. checkUnits=False to assume that there is no units row. Otherwise, look for a units row'''
+def plainIm(file:str, ic:Union[int, bool]=0, checkUnits:bool=True, usecols:List[str]=None) -> Tuple[Union[pd.DataFrame, List[Any]], Dict]:
+    '''import a csv to a pandas dataframe. ic is the index column. Int if there is an index column, False if there is none. checkUnits=False to assume that there is no units row. Otherwise, look for a units row. 
+    usecols is a list of column headers to import, so the parser can skip the rest of the columns'''
     if os.path.exists(file):
         try:
-            toprows = pd.read_csv(file, index_col=ic, nrows=2)
+            toprows = pd.read_csv(file, index_col=ic, nrows=2, usecols=usecols)
             
             toprows = toprows.fillna('')
             toprows.columns = map(str.lower, toprows.columns) # set headers to lowercase
@@ -37,9 +38,9 @@ def plainIm(file:str, ic:Union[int, bool]=0, checkUnits:bool=True) -> Tuple[Unio
                 unitdict = dict([[s,'undefined'] for s in toprows])
                 skiprows = []
             try:
-                d = pd.read_csv(file, index_col=ic, dtype=float, skiprows=skiprows)
+                d = pd.read_csv(file, index_col=ic, dtype=float, skiprows=skiprows, usecols=usecols)
             except:
-                d = pd.read_csv(file, index_col=ic, skiprows=skiprows)
+                d = pd.read_csv(file, index_col=ic, skiprows=skiprows, usecols=usecols)
         except Exception as e:
 #             logging.error(str(e))
             return [],{}
@@ -53,10 +54,12 @@ def plainExp(fn:str, data:pd.DataFrame, units:dict) -> None:
     '''export the file'''
     if len(data)==0 or len(units)==0:
         return
-    col = pd.MultiIndex.from_tuples([(k,units[k]) for k in data]) # index with units
-    data = np.array(data)
-    df = pd.DataFrame(data, columns=col)       
-    df.to_csv(fn)
+    with open(fn, 'w', newline='') as f:
+        # write the header and units rows directly, so mixed string and float columns are never combined into one object array
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(['']+list(data.columns))
+        writer.writerow(['']+[units[k] for k in data])
+        data.reset_index(drop=True).to_csv(f, header=False)   # rows end in os.linesep by default
     logging.info(f'Exported {fn}')
     
 
@@ -12,6 +12,8 @@ from datetime import datetime
 import time
 import logging, platform, socket, sys
 import traceback
+from collections import Counter
+import multiprocessing
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -32,6 +34,9 @@ for s in ['matplotlib']:
 
 #-------------------------------------------------------------------------------------------------  
 
+# legends that have already been read, keyed by (folder, legend modification time, units)
+_legendCache:Dict[Tuple[str,float,bool], Union[Tuple[dict,dict], dict]] = {}
+
 def legendFN(folder:str) -> str:
     return os.path.join(folder, 'legend.csv')
 
@@ -48,8 +53,9 @@ def importIf(folder:str) -> List[List[str]]:
 
 def legendTableToDict(t:np.array, units:bool=False) -> Union[Tuple[dict,dict], dict]:
     '''convert the table into a dictionary with unique headers'''
-    headers = [i[0] for i in t]
-    headers2 = headers
+    headers = Counter([i[0] for i in t])    # number of rows that originally had each name
+    current = Counter(headers)              # number of rows that currently have each name
+    pending = Counter()                     # renames of unique names that have not been counted yet
     section = ''
     for i in range(len(t)):
         if t[i][0]=='':
@@ -57,19 +63,26 @@ def legendTableToDict(t:np.array, units:bool=False) -> Union[Tuple[dict,dict], d
         elif t[i][0] in ['sup', 'ink', 'controlDict', 'dynamicMeshDict']:
             section = t[i][0]
         else:
-            if headers.count(t[i][0])>1:
+            if headers[t[i][0]]>1:
                 newname = t[i][0].replace(' ', '_')
                 if len(section)>0:
                     newname = f'{section}_{newname}'
-                if headers2.count(newname)>0 or len(section)==0:
+                if current[newname]+pending[newname]>0 or len(section)==0:
                     if len(t[i])>2:
                         newname = f'{newname}_{t[i][2]}'
                     else:
                         newname = f'{newname}_0'
-                t[i][0] = newname
-                headers2 = [i[0] for i in t]
+                # renaming a duplicate brings the counts up to date with every rename so far
+                current[t[i][0]]-=1
+                current[newname]+=1
+                pending.clear()
             else:
-                t[i][0] = t[i][0].replace(' ', '_')
+                newname = t[i][0].replace(' ', '_')
+                current[t[i][0]]-=1
+                current[newname]+=1
+                pending[t[i][0]]+=1
+                pending[newname]-=1
+            t[i][0] = newname
         if len(t[i])==2:
             t[i] = t[i] +['']
     values = {a[0]:a[1] for a in t}        
@@ -85,7 +98,25 @@ def legendTableToDict(t:np.array, units:bool=False) -> Union[Tuple[dict,dict], d
 
 def legendUnique(folder:str, units:bool=False) -> Union[Tuple[dict,dict], dict]:
     '''legendUnique imports a legend, rewrites the variable names so they are all unique and ready to compile into a pandas dataframe, and outputs a dictionary
-    if units=True, also imports a dictionary of units'''
+    if units=True, also imports a dictionary of units.
+    Legends are only re-read if the legend file has changed since the last call'''
+    fn = legendFN(folder)
+    if not os.path.exists(fn):
+        print('no legend')
+        return {}
+    key = (folder, os.path.getmtime(fn), units)
+    if not key in _legendCache:
+        _legendCache[key] = readLegendUnique(folder, units=units)
+    out = _legendCache[key]
+    
+    # return copies so callers can edit the dictionaries without changing the cache
+    if type(out) is tuple:
+        return dict(out[0]), dict(out[1])
+    else:
+        return dict(out)
+    
+def readLegendUnique(folder:str, units:bool=False) -> Union[Tuple[dict,dict], dict]:
+    '''import the legend and convert it to dictionaries with unique headers'''
     t = importIf(folder)
     if len(t)==0:
         return {}
@@ -101,12 +132,38 @@ def legendUnique(folder:str, units:bool=False) -> Union[Tuple[dict,dict], dict]:
     else:
         return values
 
+def legendCurrent(folder:str, fhandler:fh.folderHandler) -> bool:
+    '''determine if the legend in the folder is newer than all of the files and folders that populate reads to update an existing legend
+    fhandler is the folderHandler for the folder'''
+    fn = legendFN(folder)
+    legendTime = fh.mtime(fn)
+    if legendTime==0:
+        return False
+    cf = fhandler.caseFolder()
+    mf = fhandler.meshFolder()
+    sources = [cf, fhandler.VTKFolder()
+               , os.path.join(cf, 'system', 'controlDict')
+               , os.path.join(cf, 'log_interFoam'), os.path.join(folder, 'log_interFoam')]
+    if len(mf)>0:
+        sources.append(os.path.join(mf, 'log_snappyHexMesh'))
+    for src in sources:
+        if fh.mtime(src)>legendTime:
+            return False
+    return True
+
 def populate(folder:str, *varargin, readLogs:bool=True, overwrite:bool=False) -> List[List[str]]:
     '''populate scrapes all the data from the folder and exports it to a table called legend.csv
     folder is a full path name
     can also add strings that evaluate specific functions, e.g. scrapeTP, so that you can just scrape the transportproperties if there is already a legend'''
-    if not fh.folderHandler(folder).isSimFolder():
+    fhandler = fh.folderHandler(folder)
+    if not fhandler.isSimFolder():
         raise Exception("Not a simulation folder")
+    if not overwrite and legendCurrent(folder, fhandler):
+        # nothing has changed since the legend was updated, so there is nothing new to scrape
+        # legends that were updated before have units on every row. legends that were only scraped need to be updated once
+        t = importIf(folder)
+        if len(t)>0 and all(len(row)==3 for row in t):
+            return t
     s = scrape(folder)   # create an object to store variables
     fn = legendFN(folder)     # export file name
     # s.compareto[1] = os.path.basename(os.path.dirname(folder)) # RG
@@ -156,30 +213,37 @@ def populateToTable(folder:str, repopulate:bool = False) -> List[List[str]]:
     return t2
 
 
-def populateList(liInit:List[str], exportFilename:str, repopulate:bool = False) -> None:
+def populateList(liInit:List[str], exportFilename:str, repopulate:bool = False, processes:int=1) -> None:
     '''populateList scrapes all data for all files in a list and creates a combined table
     liInit is a list of folders to scrape
     exportFilename is the destination to export the summary file
-    repopulate is true if you want to overwrite existing legend.csv files'''
+    repopulate is true if you want to overwrite existing legend.csv files
+    processes is the number of processes to use to scrape the folders, which are independent of each other'''
     li = []
     for folder in liInit:
         if os.path.exists(folder):
             li.append(folder)
-    t1 = populateToTable(li[0], repopulate)   
+    if repopulate:
+        # overwrite times in legend.csv, or if there is no file, create a new legend file
+        getTable = populate
+    else:
+        # don't overwrite anything, just import the existing file
+        getTable = importIf
+    if processes>1 and len(li)>1:
+        with multiprocessing.Pool(processes) as pool:
+            tables = pool.map(getTable, li)
+    else:
+        tables = [getTable(l) for l in li]
+    t1 = tables[0]   
         # first collect one table so you have the format
-    tbig = [['' for i in range(len(li)+1)] for j in range(len(t1))] 
+    tbig = np.full((len(t1), len(li)+1), '', dtype=object) 
         # tbig combines all the legend files into one table
-    for i,row in enumerate(t1):
-        tbig[i][0] = row[0] 
-            # import the variable names and the values 
-            # for the first file into the big table
-        tbig[i][1] = row[1]
-    for j,l in enumerate(li[1:]): 
-        # go through the rest of the files and put the values in the big table
-        t2 = populateToTable(l, repopulate)
-        for i,row in enumerate(t2):
-            tbig[i][j+2] = row[1]
-    exportCSV(exportFilename, tbig) 
+    tbig[:,0] = [row[0] for row in t1]
+        # import the variable names from the first file into the big table
+    for j,t2 in enumerate(tables): 
+        # go through the files and put the values in column j+1 of the big table
+        tbig[:len(t2),j+1] = [row[1] for row in t2]
+    exportCSV(exportFilename, tbig.tolist()) 
         # export the combined table
     return
 
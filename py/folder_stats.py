@@ -6,6 +6,7 @@ import sys
 import os
 import csv
 import numpy as np
+import pandas as pd
 import re
 from typing import List, Dict, Tuple, Union, Any
 import logging
@@ -25,6 +26,31 @@ logger.setLevel(logging.DEBUG)
 
 
 
+LEGENDSKIP = frozenset(['folder', 'openfoam_version', ''])   # legend rows that carry no values
+LEGENDGEO = frozenset(['GEOMETRY', 'mesh'])                      # legend rows that start the geometry section
+
+# legend rows that have already been read, keyed by legend file. values are (modification time, rows)
+_legendRowsCache:Dict[str, Tuple[float, List[List[str]]]] = {}
+
+def legendRows(folder:str) -> List[List[str]]:
+    '''get the rows of the legend in the folder, up to the controlDict section. rows are only re-read from the file if the legend has changed'''
+    legendFile = os.path.join(folder, 'legend.csv')
+    try:
+        mt = os.path.getmtime(legendFile)
+    except FileNotFoundError:
+        raise FileNotFoundError(f'No legend file in {folder}') from None
+    if legendFile in _legendRowsCache and _legendRowsCache[legendFile][0]==mt:
+        return _legendRowsCache[legendFile][1]
+    rows = []
+    with open(legendFile, newline='') as csvfile:
+        reader = csv.reader(csvfile, delimiter=',', quotechar='|')
+        for row in reader:
+            if row[0]=='controlDict':
+                break
+            rows.append(row)
+    _legendRowsCache[legendFile] = (mt, rows)
+    return rows
+
 #################################################################
 
 class fluidStats:
@@ -318,15 +344,15 @@ class folderStats:
     def readLegendRow(self, row:list) -> None:
         '''read a single row from the legend.csv file'''
         row[0] = row[0].replace(' ', '_')
-        if row[0] in ['folder', 'openfoam_version', '']:
+        if row[0] in LEGENDSKIP:
             return
-        elif row[0]=='GEOMETRY' or row[0]=='mesh':
+        elif row[0] in LEGENDGEO:
             self.section = 'geo'
             return
         elif row[0]=='SYSTEM_SYSTEM':
             self.section = 'system'
             return
-        elif row[0]=='bath_velocity' or row[0]=='bath velocity':
+        elif row[0]=='bath_velocity':
             self.section = 'system'
             
         if len(row)<3:
@@ -337,24 +363,17 @@ class folderStats:
             self.geo.addVal(row[0], row[1], row[2])
         elif row[0].startswith('ink'):
             self.ink.addVal(row[0], row[1], row[2])
-        elif row[0].startswith('sup') or row[0].startswith('bath'):  
+        elif row[0].startswith(('sup', 'bath')):  
             self.sup.addVal(row[0].replace('bath', 'sup'), row[1], row[2])
         elif row[0]=='sigma':
             self.addSigma(row[1], row[2])
 
     def readLegend(self):
         '''read all values from the legend'''
-        legendFile = os.path.join(self.folder, 'legend.csv')
-        if not os.path.exists(legendFile):
-            raise FileNotFoundError(f'No legend file in {self.folder}')
         self.section = 'time'
-        with open(legendFile, newline='') as csvfile:
-            reader = csv.reader(csvfile, delimiter=',', quotechar='|')
-            for row in reader:
-                # save all rows as class attributes
-                if row[0]=='controlDict':
-                    return
-                self.readLegendRow(row)    
+        for row in legendRows(self.folder):
+            # save all rows as class attributes
+            self.readLegendRow(list(row))    
        
     def getVal(self, s:str) -> Any:
         '''find a value'''
@@ -545,3 +564,30 @@ class folderStats:
             d['ReRatio'] = self.ink.dynamic['Re']/self.sup.dynamic['Re']
             u['ReRatio'] = ''
         return d,u
+
+
+#################################################################
+
+def fluidViscArrays(fluids:List[fluidStats]) -> Tuple[np.ndarray, np.ndarray]:
+    '''get the viscosity at the nozzle shear rate and the reynolds number for a list of fluidStats objects at once, as in fluidStats.localVisc. 
+    fluids without a density get nan'''
+    def col(name:str, key:str) -> np.ndarray:
+        return np.array([getattr(f, name).get(key, np.nan) for f in fluids], dtype=np.float64)
+    newtonian = np.array([f.transportModel=='Newtonian' for f in fluids], dtype=bool)
+    nu0 = col('dynamic', 'nu0')
+    gdot = col('dynamic', 'v')/col('dynamic', 'd')   # shear rate in 1/s
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hb = np.fmin(nu0, col('dynamic', 'tau0')/gdot + col('dynamic', 'k')*gdot**(col('dynamic', 'n')-1)) # HB equation
+        visc = np.where(newtonian, col('dynamic', 'nu'), np.where(gdot>0, hb, nu0))
+        visc[np.isnan(col('dynamic', 'rho'))] = np.nan
+        Re = col('kinematic', 'rho')*col('kinematic', 'v')*col('kinematic', 'd')/visc
+    return visc, Re
+
+def viscRatios(folders:List[str]) -> pd.DataFrame:
+    '''get the ink/support viscosity and reynolds number ratios for a list of folders, as in folderStats.viscRatio. 
+    the legends are read one folder at a time, and the rheology is calculated for all folders at once'''
+    fslist = [folderStats(folder) for folder in folders]
+    inkvisc, inkRe = fluidViscArrays([fs.ink for fs in fslist])
+    supvisc, supRe = fluidViscArrays([fs.sup for fs in fslist])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({'folder':folders, 'viscRatio':inkvisc/supvisc, 'ReRatio':inkRe/supRe})
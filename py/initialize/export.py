@@ -62,9 +62,8 @@ def exportFile(folder:str, file:str, text:str, linux:bool=False) -> None:
     file is a basename
     text is the text to export'''
     fn = os.path.join(folder, file)
-    File_object = open(fn,"w")
-    File_object.write(text)
-    File_object.close()
+    with open(fn, 'w') as File_object:
+        File_object.write(text)
     logging.debug("Exported %s" % fn)
     if linux:
         replaceCR(fn)
@@ -40,19 +40,24 @@ def takePlane(df:pd.DataFrame, folder:str, dr:float=0.05, xhalf:bool=True) -> pd
     na = fs.geo.nozzle_angle
     tana = np.tan(np.deg2rad(na))        # tangent of nozzle angle
     zbot = fs.geo.nbz
-    df['z'] =[zbot - i for i in df['z']] # put everything relative to the bottom of the nozzle
+    df['z'] = zbot - df['z'].values # put everything relative to the bottom of the nozzle
     ztop = fs.geo.nozzle_length
-    df = df[df['z']>-ztop*0.9]           # cut off the top 10% of the nozzle
-    
     dy = di/3                           # take middle y portion of nozzle
-    df = df[(df['y']>-1*(dy))&(df['y']<dy)] # only select y portion
+    xv = df['x'].values
+    yv = df['y'].values
+    zv = df['z'].values
+    mask = (zv>-ztop*0.9)&(yv>-1*(dy))&(yv<dy)  # cut off the top 10% of the nozzle and only select y portion
     if xhalf:
-        df = df[(df['x']>xc)] # back half of nozzle
+        mask &= (xv>xc) # back half of nozzle
+    df = df.loc[mask].copy()
     
-    df['rbar'] = [np.sqrt((row['x']-xc)**2+(row['y']-yc)**2)/(di/2+abs(row['z'])*tana) for i,row in df.iterrows()]
-    df['rbar'] = [round(int(rbar/dr)*dr,5) for rbar in df['rbar']] # round to the closest dr
+    xv = df['x'].values
+    yv = df['y'].values
+    zv = df['z'].values
+    rbar = np.sqrt((xv-xc)**2+(yv-yc)**2)/(di/2+np.abs(zv)*tana)
+    df['rbar'] = np.round(np.trunc(rbar/dr)*dr, 5) # round to the closest dr
         # radius as fraction of total radius at that z
-    df = df[df['rbar']<0.95]
+    df = df.loc[df['rbar'].values<0.95]
         
     return df
 
@@ -5,6 +5,7 @@
 import numpy as np
 import os
 import re
+import mmap
 import matplotlib.pyplot as plt
 import pandas as pd
 import csv
@@ -13,6 +14,8 @@ import errno
 from typing import List, Dict, Tuple, Union, Any, TextIO
 from datetime import datetime
 import time
+import multiprocessing
+from operator import attrgetter
 import logging, platform, socket, sys
 from backwardsRead import fileReadBackwards
 
@@ -28,6 +31,21 @@ logger.setLevel(logging.DEBUG)
 for s in ['matplotlib', 'imageio', 'IPython', 'PIL']:
     logging.getLogger(s).setLevel(logging.WARNING)
 
+# compiled patterns for splitting lines in log_interFoam, which is read as bytes
+COURANT = re.compile(b'Courant Number mean: | max: ')       # start of a time step
+UNREFINED = re.compile(b'Unrefined from | to | cells.$')     # mesh refinement
+# lines that logRead parses, without the newline before them
+LOGLINE = re.compile(b'\n((?:Courant|deltaT|Time = |Unrefined from |smoothSolver|DICPCG:  Solving for p_rgh,|ExecutionTime)[^\r\n]*)')
+LOGHEADER = re.compile(b'(?:[^\n]*\n){49}')    # header and startup lines at the top of log_interFoam
+
+# case folder for each folder given to interFile. the case folder doesn't move during a run, so only look for it once
+_caseFolderCache:Dict[str, str] = {}
+
+# parsed log for each interFoam log, with the mtime and size of the log when it was parsed
+_logCache:Dict[str, Tuple[Tuple[float, int], pd.DataFrame]] = {}
+
+# format of log_read.npz. increase this when the parsed columns change so old files are parsed again
+LOGCACHEVERSION = 1
 
 #-------------------------------------------------------------------------------------------------       
 
@@ -38,7 +56,9 @@ def logEntry() -> Dict:
 def interFile(folder:str) -> str:
     '''interFile finds the interFoam log
     folder can be a case folder or its parent'''
-    cf = caseFolder(folder)
+    if not folder in _caseFolderCache:
+        _caseFolderCache[folder] = caseFolder(folder)
+    cf = _caseFolderCache[folder]
     fn = os.path.join(cf, 'log_interFoam')
     if not os.path.exists(fn):
         fn = os.path.join(os.path.dirname(cf), 'log_interFoam')
@@ -55,76 +75,132 @@ def selectIf(strs:List[str], i:int) -> float:
             return f
     else:
         raise NameError
+    
+def floatBetween(line:bytes, start:bytes, end:bytes=b'') -> float:
+    '''Get the float between the first occurrence of start and the next occurrence of end, or the end of the line if end is empty or missing. If start is missing or the value is not a number, raise an error'''
+    i = line.find(start)
+    if i<0:
+        raise NameError
+    i = i+len(start)
+    j = line.find(end, i) if end else -1
+    try:
+        f = float(line[i:j] if j>=0 else line[i:])
+    except Exception as e:
+        raise NameError
+    else:
+        return f
 
 
-def logRead(folder:str) -> List[logEntry]:
-    '''logRead extracts values from log files and stores them in a list of logEntry objects
-    folder can be a case folder or its parent'''
+def logCacheFile(intf:str) -> str:
+    '''get the name of the file that holds the parsed values from the interFoam log intf'''
+    return os.path.join(os.path.dirname(intf), 'log_read.npz')
+
+def readLogCache(intf:str, key:Tuple[float, int]) -> Union[pd.DataFrame, None]:
+    '''import the parsed values for the interFoam log intf from log_read.npz, if it was written in the current LOGCACHEVERSION when the log had the mtime and size in key. otherwise, return None'''
+    cfn = logCacheFile(intf)
+    if not os.path.exists(cfn):
+        return None
+    try:
+        with np.load(cfn) as d:
+            if np.array_equal(d['meta'], np.array((LOGCACHEVERSION,)+tuple(key))):
+                return pd.DataFrame({k:d[k] for k in d.files if not k=='meta'})
+    except Exception as e:
+        logging.warning(f'Could not read {cfn}: {e}')
+    return None
+
+def parseLog(intf:str) -> pd.DataFrame:
+    '''parseLog extracts values from the interFoam log intf and stores them in a dataframe with one column per logEntry value and one row per time step'''
+    if os.path.getsize(intf)==0:
+        return pd.DataFrame([])
+    with open(intf, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # skip all the headers and startup output
+        header = LOGHEADER.match(mm)
+        if header is None:
+            return pd.DataFrame([])
+        # most lines are output from other solvers, so only pull out the lines we need
+        lines = LOGLINE.findall(mm, header.end()-1)
+    cols = list(logEntry())
+    ti = cols.index('simTime')
+    ci = cols.index('cells')
+    table = np.zeros((len(cols), 4096))  # one row per value, one column per time step, grown as needed
+    n = 0                                # number of time steps stored in table
+    for line in lines:
+        try:
+            if line.startswith(b'Courant'): # we've hit a new time step
+                newEntry = logEntry()
+                if n>0:
+                    newEntry['cells'] = table[ci, n-1] 
+                    # copy the number of cells from the last step and only adjust if the log says the number changed
+                strs = COURANT.split(line)
+                newEntry['courantmin'] = selectIf(strs, 1)
+                newEntry['courantmax'] = selectIf(strs, 2)
+            if line.startswith(b'deltaT'):
+                newEntry['deltaT'] = float(line[9:])    # deltaT = X
+            elif line.startswith(b'Time = '):
+                newEntry['simTime'] = float(line[7:])   # Time = X
+            elif line.startswith(b'Unrefined from '):
+                strs = UNREFINED.split(line)
+                newEntry['cells'] = selectIf(strs, 2)
+                if n>0 and table[ci, n-1]==0:
+                    table[ci, :n] = float(strs[1])
+                    # the log never says the initial number of cells, 
+                    # but it says the previous number if it changes the number of cells, 
+                    # so to get the initial value, look for the first time the mesh is refined
+            elif line.startswith(b'smoothSolver'):
+                newEntry['ralpha'] = floatBetween(line, b'Final residual = ', b', No Iterations')
+            elif line.startswith(b'DICPCG:  Solving for p_rgh,'):
+                newEntry['rprgh'] = floatBetween(line, b'Final residual = ', b', No Iterations')
+            elif line.startswith(b'ExecutionTime'):
+                newEntry['realtime'] = float(line[16:line.index(b' s', 16)])   # ExecutionTime = X s  ClockTime = Y s
+                if newEntry['ralpha']>0 and newEntry['rprgh']>0:
+                    while n>0 and newEntry['simTime']<table[ti, n-1]:
+                        n = n-1
+                    if n==table.shape[1]:
+                        table = np.concatenate([table, np.zeros(table.shape)], axis=1)
+                    table[:, n] = list(newEntry.values())
+                    n = n+1
+                
+        except Exception as e:
+            # if we hit an error, skip this line
+            print(f'error hit: {e}')
+            pass
+    if n<=1:
+        return pd.DataFrame([])
+    return pd.DataFrame(dict(zip(cols, table[:, 1:n])))   # drop the first time step
+
+
+def logRead(folder:str, cache:bool=False) -> pd.DataFrame:
+    '''logRead extracts values from log files and stores them in a dataframe with one column per logEntry value and one row per time step
+    the values are stored in memory, and only parsed again if the log has changed since then
+    folder can be a case folder or its parent
+    cache=True to also store the values in log_read.npz next to the log, so they survive between sessions'''
     intf = interFile(folder)
-    li = []   # this will be a list of logEntry objects
-    if os.path.exists(intf):
-        with open(intf, 'r') as f:
-            for i in range(50): # skip all the headers and startup output
-                line = f.readline()
-            while line:
-                try:
-                    if line.startswith('Courant'): # we've hit a new time step
-                        newEntry = logEntry()
-#                         li.append(logEntry()) # create a new object and store it in the list
-#                         lectr+=1
-                        if len(li)>0:
-                            newEntry['cells'] = li[-1]['cells'] 
-                            # copy the number of cells from the last step and only adjust if the log says the number changed
-                        strs = re.split('Courant Number mean: | max: |\n', line)
-                        newEntry['courantmin'] = selectIf(strs, 1)
-                        newEntry['courantmax'] = selectIf(strs, 2)
-                    if line.startswith('deltaT'):
-                        strs = re.split('deltaT = |\n', line)
-                        newEntry['deltaT'] = selectIf(strs, 1)
-                    elif line.startswith('Time = '):
-                        strs = re.split('Time = |\n', line)
-                        newEntry['simTime'] = selectIf(strs, 1)
-                    elif line.startswith('Unrefined from '):
-                        strs = re.split('Unrefined from | to | cells.\n', line)
-                        newEntry['cells'] = selectIf(strs, 2)
-                        if len(li)>0 and li[-1]['cells']==0:
-                            for i in range(len(li)):
-                                li[i]['cells'] = float(strs[1])
-                                # the log never says the initial number of cells, 
-                                # but it says the previous number if it changes the number of cells, 
-                                # so to get the initial value, look for the first time the mesh is refined
-                    elif line.startswith('smoothSolver'):
-                        strs = re.split('Final residual = |, No Iterations', line)
-                        newEntry['ralpha'] = selectIf(strs, 1)
-                    elif line.startswith('DICPCG:  Solving for p_rgh,'):
-                        strs = re.split('Final residual = |, No Iterations', line)
-                        rprgh = selectIf(strs, 1)
-                        newEntry['rprgh'] = rprgh
-                    elif line.startswith('ExecutionTime'):
-                        strs = re.split('ExecutionTime = | s', line)
-                        newEntry['realtime'] = selectIf(strs, 1)
-                        if newEntry['ralpha']>0 and newEntry['rprgh']>0:
-                            while len(li)>0 and newEntry['simTime']<li[-1]['simTime']:
-                                li = li[:-1]
-                            li.append(newEntry)
-                        
-                except Exception as e:
-                    # if we hit an error, skip this line
-                    print(f'error hit: {e}')
-                    pass
-                line = f.readline()
-            li = li[1:]    
-        #### plot 
-        # plotAll(folder, li) 
-        # rAlphaPlot(folder, li)
-    return pd.DataFrame(li)
+    if not os.path.exists(intf):
+        return pd.DataFrame([])
+    st = os.stat(intf)
+    key = (st.st_mtime, st.st_size)
+    if intf in _logCache and _logCache[intf][0]==key:
+        return _logCache[intf][1].copy()
+    li = readLogCache(intf, key) if cache else None
+    if li is None:
+        li = parseLog(intf)
+        if cache:
+            try:
+                np.savez(logCacheFile(intf), meta=np.array((LOGCACHEVERSION,)+tuple(key)), **{k:li[k].to_numpy() for k in li.columns})
+            except Exception as e:
+                logging.warning(f'Could not write {logCacheFile(intf)}: {e}')
+    _logCache[intf] = (key, li.copy())
+    #### plot 
+    # plotAll(folder, li) 
+    # rAlphaPlot(folder, li)
+    return li
 
 
 def la(li:List[Any], at:str) -> List[Any]:
     '''list an attribute for each object in a list
     li is a list of objects
     at is the attribute that we want to get from each object'''
-    return list(getattr(o, at) for o in li)
+    return list(map(attrgetter(at), li))
 
 #--------------------------------------------------
 # plots
@@ -175,18 +251,23 @@ def plotConvergence(folder:str, li:Union[List, pd.DataFrame], export:bool=False,
 
 
 
-def rAlphaPlot(folders:List[str], lis:List[Any]):
+def rAlphaPlot(folders:List[str], lis:List[Any], processes:int=1):
     '''plot just the alpha residual over time
     folders ia a list of folders
-    lis is a list of lists of logEntry objects'''
+    lis is a list of dataframes from logRead
+    processes is the number of processes to use to read the logs if lis is empty, which are independent of each other'''
     if len(lis)==0:
-        lis = [logRead(folder) for folder in folders]
+        if processes>1 and len(folders)>1:
+            with multiprocessing.Pool(processes) as pool:
+                lis = pool.map(logRead, folders)
+        else:
+            lis = [logRead(folder) for folder in folders]
     fs = 12
     fig, axs = plt.subplots(1)
     fig.set_size_inches(8, 8)
     colors = ['firebrick', 'darkblue', 'burlywood', 'dodgerblue']
     for i, li in enumerate(lis):
-        axs.plot(la(li, 'simTime'), la(li, 'ralpha'), colors[i], label=folders[i])
+        axs.plot(li['simTime'], li['ralpha'], colors[i], label=folders[i])
     axs.set_xlabel('Time in simulation (s)', fontsize=fs) 
     axs.set_ylabel('Alpha residual', fontsize=fs) 
     axs.legend()
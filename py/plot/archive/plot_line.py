@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import List, Dict, Tuple, Union, Any, TextIO
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -27,10 +28,13 @@ plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.sans-serif'] = ['Arial']
 plt.rcParams['font.size'] = 10
 
+# variable nicknames, built once for all labels
+_VN = varNicknames()
+
 
 #-------------------------------------------
 
-def linePlot(folder:str, time:float, ax:plt.Axes, color, yvar:str='vx', label:str='', zname:str='z', zunits:str='mm', **kwargs) -> None:
+def linePlot(folder:str, time:float, ax:plt.Axes, color, yvar:str='vx', label:str='', zname:str='z', zunits:str='mm', tp:dict=None, **kwargs) -> None:
     '''plot the result of a line trace collected with paraview
         folder is the simulation to plot
         time is the time at which to collect the line
@@ -40,66 +44,77 @@ def linePlot(folder:str, time:float, ax:plt.Axes, color, yvar:str='vx', label:st
         label is the label to write on the line
         zname is the variable to plot on the x axis
         zunits = 'mm' or any other value in legendUnique, e.g. 'nozzle_inner_width'
+        tp is the extractTP dictionary for the folder, if it has already been collected
         '''
     t1,units = intm.importLine(folder, time, **kwargs)
     if len(t1)==0:
         logging.warning(f'Line file is missing in {folder}')
         return 
     t1 = t1.sort_values(by=zname)
+    fcols = t1.select_dtypes('float64').columns
+    t1[fcols] = t1[fcols].astype(np.float32)   # only plotting precision is needed, so halve the memory of the trace
+    if zname=='z' or not zunits=='mm':
+        le = fp.legendUnique(folder)    # read the legend once for both conversions
     if zname=='z':
-        le = fp.legendUnique(folder)
-        t1[zname] = [float(le['nozzle_bottom_coord'])-zi for zi in t1[zname]]
+        t1[zname] = float(le['nozzle_bottom_coord']) - t1[zname].values
         # shift origin up
     
     if not zunits=='mm':
-        le = fp.legendUnique(folder)
-        t1[zname] = t1[zname]/float(le[zunits])
+        t1[zname] = t1[zname].values/float(le[zunits])
 
     
     if yvar in t1:
         ystrink = yvar
         ystrsup = yvar
     elif yvar=='nu':
-        tp = extractTP(folder)
+        if tp is None:
+            tp = extractTP(folder)
         ystrsup = 'nu_sup'
         ystrink = 'nu_ink'
         # viscosity yvar
         if 'nu_sup' in t1:
-            t1['nu_sup']=t1['nu_sup']*10**3 # this is specifically when the density is 10**3 kg/m^3
+            t1['nu_sup']=t1['nu_sup'].values*10**3 # this is specifically when the density is 10**3 kg/m^3
         else:
-            nu_suplist = [tp['nusup'] for i in range(len(t1))]
-            t1['nu_sup'] = nu_suplist
+            t1['nu_sup'] = tp['nusup']
         if 'nu_ink' in t1:
-            t1['nu_ink']=t1['nu_ink']*10**3
+            t1['nu_ink']=t1['nu_ink'].values*10**3
         else:
-            nu_inklist = [tp['nuink'] for i in range(len(t1))]
-            t1['nu_ink'] = nu_inklist
+            t1['nu_ink'] = tp['nuink']
     elif yvar=='shearrate':
         ystrsup = 'shearrate'
         ystrink = 'shearrate'
-        t1['shearrate'] = [np.linalg.norm(np.array([[row['shearrate0'],row['shearrate1'],row['shearrate2']],[row['shearrate3'],row['shearrate4'],row['shearrate5']],[row['shearrate6'],row['shearrate7'],row['shearrate8']]])) for i,row in t1.iterrows()]
+        arr = t1[[f'shearrate{i}' for i in range(9)]].to_numpy(dtype=np.float32)
+        t1['shearrate'] = np.sqrt(np.einsum('ij,ij->i', arr, arr)) # Frobenius norm of the 3x3 shear rate tensor in each row
     else:
         raise NameError(f'yvar must be column in line csv or \'nu\', given {yvar}')
 
-    inkPts = t1[t1['alpha']>0.5]
+    ink = t1['alpha'].values>0.5
+    inkPts = t1.iloc[np.flatnonzero(ink)]
 
+    z = t1[zname].values
+    minx = z[ink].min()
+    maxx = z[ink].max()
+    # t1 is sorted by z, or reverse sorted if the origin was shifted, so the support on either side of the ink is a run of rows
+    if len(z)>1 and z[0]>z[-1]:
+        supPtsLeft = t1.iloc[np.searchsorted(-z, -minx, side='right'):]
+        supPtsRight = t1.iloc[:np.searchsorted(-z, -maxx, side='left')]
+    else:
+        supPtsLeft = t1.iloc[:np.searchsorted(z, minx, side='left')]
+        supPtsRight = t1.iloc[np.searchsorted(z, maxx, side='right'):]
     
-    minx = min(inkPts[zname])
-    maxx = max(inkPts[zname])
-    supPtsLeft = t1[t1[zname]<minx]
-    supPtsRight = t1[t1[zname]>maxx]
-    
-    for suppts in [supPtsLeft, supPtsRight]:
-        ax.plot(suppts[zname], suppts[ystrsup], color=color, linewidth=0.75)
+    # plot the support on both sides as one line, broken at the NaN between the two sides
+    xs = np.concatenate([supPtsLeft[zname].values, [np.nan], supPtsRight[zname].values])
+    ys = np.concatenate([supPtsLeft[ystrsup].values, [np.nan], supPtsRight[ystrsup].values])
+    ax.plot(xs, ys, color=color, linewidth=0.75)
         
     ax.plot(inkPts[zname], inkPts[ystrink], color=color, linestyle='--', linewidth=0.75)
-    pts = t1[(t1[zname]==minx) | (t1[zname]==maxx)]
+#     pts = t1[(t1[zname]==minx) | (t1[zname]==maxx)]
 #     ax.scatter(pts[zname], pts[ystrink], color=color, label=label)
 #     ax.scatter(pts[zname], pts[ystrsup], color=color)
     
     
 def labDict(yvar:str) -> str:
-    return varNicknames().labDict(yvar)
+    return _VN.labDict(yvar)
 #     '''dictionary for variable headers in line traces'''
 #     if yvar=='vx':
 #         return ('$x$ velocity (mm/s)')
@@ -136,13 +151,15 @@ def linePlots(folders:List[str], cvar, time:float=2.5, imsize:float=3.25, yvar:s
     
     if type(cvar) is str: 
         # this is a column header from extractTP
-        tplist = pd.DataFrame([extractTP(folder) for folder in folders])
+        tps = [extractTP(folder) for folder in folders]
+        tpdict = dict([[tp['folder'], tp] for tp in tps])  # so linePlot doesn't have to collect these again
+        tplist = pd.DataFrame(tps)
         tplist.sort_values(by=cvar, inplace=True)
         tplist.reset_index(drop=True, inplace=True)
         tplist[cvar] = expFormatList(list(tplist[cvar]))
         cm = sns.color_palette('viridis', as_cmap=True) # uses viridis color scheme
-        for i,row in tplist.iterrows():
-            linePlot(row['folder'], time, ax, cm(i/len(tplist)), yvar, cmap=cm, label=row[cvar], zunits=zunits, **kwargs)
+        for i,(folder,lab) in enumerate(zip(tplist['folder'], tplist[cvar])):
+            linePlot(folder, time, ax, cm(i/len(tplist)), yvar, cmap=cm, label=lab, zunits=zunits, tp=tpdict[folder], **kwargs)
     else:
         # this is a function operated on extractTP
         funcvals = unqListFolders(folders, cvar)
@@ -219,20 +236,36 @@ def linePlots0(topFolder:str, exportFolder:str, cvar:str, time:float, imsize:flo
         fig = linePlots(folders, cvar, time, imsize, yvar, **kwargs)
     if export:
         intm.exportIm(fn, fig) # export figure
+        plt.close(fig)  # release the figure so batch runs don't keep every figure in memory
 
 
 
 #------------------------------
 
 
+def maxBetween(x:np.ndarray, p:np.ndarray, xmin:float, xmax:float) -> float:
+    '''get the max value of p where xmin<x<xmax, ignoring nan. x must be sorted'''
+    pslice = p[np.searchsorted(x, xmin, side='right'):np.searchsorted(x, xmax, side='left')]
+    pslice = pslice[~np.isnan(pslice)]
+    if len(pslice)==0:
+        return np.nan
+    return pslice.max()
+
 def linePressure(folder:str) -> dict:
     '''get the pressure differential across the nozzle'''
     file = os.path.join(folder, 'line_t_10_z_0.5.csv')
     if not os.path.exists(file):
         return {}, {}
-    data, units = intm.importPointsFile(file) 
-    pUpstream = data[(data.x>-2.9)&(data.x<-2.87)].p.max() # upstream pressure
-    pDownstream = data[(data.x>-1.96)&(data.x<-1.9)].p.max() # downstream pressure
+    data, units = intm.plainIm(file, ic=False, usecols=['x', 'p'])   # only parse the columns we need
+    if len(data)==0:
+        return {}, {}
+    if units['x']=='m':
+        data['x'] = data['x'].values*1000   # positions below are in mm
+    order = np.argsort(data['x'].values, kind='stable')
+    x = data['x'].values[order]
+    p = data['p'].values[order]
+    pUpstream = maxBetween(x, p, -2.9, -2.87) # upstream pressure
+    pDownstream = maxBetween(x, p, -1.96, -1.9) # downstream pressure
     dp = pUpstream-pDownstream
     pdict = {'pU':pUpstream, 'pD':pDownstream, 'dP':dp}
     units = {'pU':units['p'], 'pD':units['p'], 'dP':units['p']}
@@ -241,32 +274,50 @@ def linePressure(folder:str) -> dict:
     units = {**u, **units}
     return retval, units
 
-def linePressureRecursive(folder:str) -> dict:
-    '''find line pressures for all sims in folder, all the way down'''
-    if not os.path.isdir(folder):
-        return [], {}
-    r,u = linePressure(folder)
-    if len(r)>0:
-        return [r],u
+def linePressureRecursive(folder:str, workers:int=1) -> dict:
+    '''find line pressures for all sims in folder, all the way down. 
+    workers is the number of threads to read the sims with. reading is mostly file I/O, so threads can overlap it'''
+    sims = []
+    for dirpath, dirnames, files in os.walk(folder, followlinks=True):
+        if 'line_t_10_z_0.5.csv' in files:
+            sims.append(dirpath)
+            dirnames[:] = []   # don't look for sims inside of sims
+    if workers>1 and len(sims)>1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(linePressure, sims))
     else:
-        rlist = []
-        units = {}
-        for f in os.listdir(folder):
-            r,u = linePressureRecursive(os.path.join(folder, f))
+        results = [linePressure(sim) for sim in sims]
+        
+    rlist = []
+    units = {}
+    for sim, (r,u) in zip(sims, results):
+        if len(r)==0:
+            # the line trace couldn't be read, so look for sims inside of this folder
+            r = []
+            for entry in os.scandir(sim):
+                if entry.is_dir():
+                    r2,u2 = linePressureRecursive(entry.path, workers=workers)
+                    if len(r2)>0:
+                        r = r+r2
+                        u = u2
+            rlist = rlist+r
             if len(r)>0:
-                rlist = rlist+r
                 units = u
-        return rlist, units
+        else:
+            rlist.append(r)
+            units = u
+    return rlist, units
 
-def linePressures(topfolder:str, exportFolder:str, filename:str) -> dict:
-    '''find pressure differential between upstream and downstream surface of nozzle along the line traces for all sims in folder and export'''
-    rlist, units = linePressureRecursive(topfolder)
-    tt = pd.DataFrame(rlist)
+def linePressures(topfolder:str, exportFolder:str, filename:str, workers:int=1) -> dict:
+    '''find pressure differential between upstream and downstream surface of nozzle along the line traces for all sims in folder and export. 
+    workers is the number of threads to read the sims with'''
+    rlist, units = linePressureRecursive(topfolder, workers=workers)
+    keys = list(dict.fromkeys([k for r in rlist for k in r]))   # every column, in order of appearance
+    tt = pd.DataFrame(dict([[k, [r.get(k, np.nan) for r in rlist]] for k in keys]))   # build the table column by column
     if os.path.exists(exportFolder):
         fn = os.path.join(exportFolder, filename)
-        col = pd.MultiIndex.from_tuples([(k,v) for k, v in units.items()])
-        data = np.array(tt)
-        df = pd.DataFrame(data, columns=col)       
+        df = tt[list(units.keys())]   # keep each column's own dtype instead of converting everything to one array
+        df.columns = pd.MultiIndex.from_tuples([(k,v) for k, v in units.items()])
         df.to_csv(fn)
         logging.info(f'Exported {fn}')
     return tt,units
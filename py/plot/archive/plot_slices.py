@@ -44,7 +44,8 @@ def plotSlices(data:pd.DataFrame) -> plt.Figure:
         sidelegend = False
     p = d.plot.scatter(x='y', y='z', c=color, xlim=[-1, 1], ylim=[-1, 1], legend=False,\
                colormap = cmap, figsize=[size, size], \
-               xticks=ticks, yticks=ticks, sharex=False, s=0.1)
+               xticks=ticks, yticks=ticks, sharex=False, s=0.1, rasterized=True)
+                # rasterize the points so vector exports hold one image instead of one element per point
     p.set_aspect('equal', adjustable='box')
     p.set_xlabel('y (mm)')
     p.set_ylabel('z (mm)')
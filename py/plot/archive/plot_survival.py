@@ -12,6 +12,7 @@ import seaborn as sns
 import math
 from typing import List, Dict, Tuple, Union, Any, TextIO
 import logging
+import multiprocessing
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -38,6 +39,14 @@ matplotlib.rc('font', size='8.0')
 #-------------------------------------------
 #--------------------------------
 
+# viridis palettes that have already been made, keyed by number of colors
+_paletteCache:Dict[int, list] = {}
+
+def viridisPalette(n:int) -> list:
+    '''get a list of n colors in the viridis color scheme. each palette is only made once'''
+    if not n in _paletteCache:
+        _paletteCache[n] = sns.color_palette('viridis', n_colors=n)
+    return _paletteCache[n]
         
 def unitName(zunits:str) -> str:
     '''convert the units name to something more readable and compact'''
@@ -83,54 +92,97 @@ def survivalEqLabel(a,b,c):
 class survival:
     '''holds info about survival over the length of the nozzle'''
     
-    def __init__(self, rbar:float, a:float=10**-4, b:float=0.5, c:float=0.5):
+    def __init__(self, rbar:float, a:float=10**-4, b:float=0.5, c:float=0.5, nsteps:int=100):
         '''rbar is the normalized radius
-        a,b,c are model parameters'''
+        a,b,c are model parameters
+        nsteps is the expected number of steps, used to size the arrays. the arrays grow if there are more steps'''
         self.rbar = rbar
-        self.zlist = [] # this must be in mm
-        self.xlist = [] # this must be in mm
+        self.n = 0 # number of steps stored. only the first n values of each array are valid
+        self.zlist = np.zeros(nsteps) # this must be in mm
+        self.xlist = np.zeros(nsteps) # this must be in mm
         self.totalI = 1 # current survival fraction
-        self.Ilist = [1]
-        self.tlist = [0] # this is in s
-        self.dtlist = [0]
-        self.taulist = [0]
-        self.vlist = [0]
+        self.Ilist = np.ones(nsteps)
+        self.tlist = np.zeros(nsteps) # this is in s
+        self.dtlist = np.zeros(nsteps)
+        self.taulist = np.zeros(nsteps)
+        self.vlist = np.zeros(nsteps)
         self.a = a
         self.b = b
         self.c = c
         
-    def addStep(self, row:pd.Series) -> None:
-        '''add the point to the survival'''
-        if len(self.zlist)==0:
+    def grow(self) -> None:
+        '''double the length of the arrays'''
+        for s in ['zlist', 'xlist', 'tlist', 'dtlist', 'taulist', 'vlist']:
+            l = getattr(self, s)
+            setattr(self, s, np.concatenate([l, np.zeros(max(len(l),1))]))
+        self.Ilist = np.concatenate([self.Ilist, np.ones(max(len(self.Ilist),1))])
+        
+    def addStep(self, z:float, x:float, v:float, tau:float) -> None:
+        '''add the point to the survival. z and x are the position in mm, v is the velocity magnitude, and tau is the shear stress magnitude'''
+        if self.n==len(self.zlist):
+            self.grow()
+        n = self.n
+        if n==0:
             # start at 100% survival
-            self.zlist.append(row['z'])
-            self.xlist.append(row['x'])
+            self.zlist[0] = z
+            self.xlist[0] = x
+            self.n = 1
             return
         else:
-            v = row['magu'] # velocity magnitude
-            traveled = np.sqrt((self.zlist[-1] - row['z'])**2 + (self.xlist[-1]-row['x'])**2)
+            traveled = np.sqrt((self.zlist[n-1] - z)**2 + (self.xlist[n-1]-x)**2)
             dt = traveled/v # difference in time since last step
-            tau = row['shearstressmag'] 
-            if v<0.1*self.vlist[-1]:
+            if v<0.1*self.vlist[n-1]:
                 # velocity discontinuity, abort
                 return
             
             Ii = np.exp(-self.a*tau**self.b*dt**self.c) # survival during this step
             Ii = min(1, Ii)
             self.totalI = self.totalI*Ii # survival overall
-            self.Ilist.append(self.totalI) # keep track of survival at each step
-            self.tlist.append(self.tlist[-1]+dt)
-            self.taulist.append(tau)
-            self.dtlist.append(dt)
-            self.xlist.append(row['x'])
-            self.zlist.append(row['z'])
-            self.vlist.append(v)
+            self.Ilist[n] = self.totalI # keep track of survival at each step
+            self.tlist[n] = self.tlist[n-1]+dt
+            self.taulist[n] = tau
+            self.dtlist[n] = dt
+            self.xlist[n] = x
+            self.zlist[n] = z
+            self.vlist[n] = v
+            self.n = n+1
                 
     def addUnits(self, normval:float) -> None:
         '''divide the units of the z variable by the given value'''
-        self.zlist = [z/normval for z in self.zlist]
+        self.zlist /= normval
 
         
+def importNoz(folder:str, time:float, volume:bool, ptsCache:dict=None) -> Tuple[pd.DataFrame, dict]:
+    '''import the points in the nozzle. volume = True to use the whole volume of the nozzle, otherwise use a slice from the center of the nozzle. 
+    ptsCache is an optional dictionary to keep imported points in, so plots that use the same points only read the file once. 
+    points from the cache are copied, so callers can modify them'''
+    key = (folder, time, volume)
+    if ptsCache is not None and key in ptsCache:
+        df, units = ptsCache[key]
+        return df.copy(), units
+    if volume:
+        df,units = intm.importPtsNoz(folder, time) # get points in nozzle
+    else:
+        df,units = intm.importSliceNoz(folder, time) # get points in nozzle
+    if ptsCache is not None:
+        ptsCache[key] = (df, units)
+        return df.copy(), units
+    return df, units
+        
+def survivalRings(folder:str, time:float, dr:float, volume:bool, xhalf:bool) -> Tuple[Union[pd.DataFrame, None], int]:
+    '''import the points in the nozzle and average them in each ring, at each z position. 
+    returns the rings and the number of z positions, or None if there are no points. 
+    this does not depend on the survival model parameters, so it can be reused for different a,b,c'''
+    df,units = importNoz(folder, time, volume)
+    if len(df)==0:
+        return None, 0
+    
+    df = intm.takePlane(df, folder, dr=dr, xhalf=xhalf) # take just the middle plane
+    nz = len(df.z.unique())
+    rings = df[df['magu']>0].groupby(['z', 'rbar'], as_index=False, sort=True)[['x', 'magu', 'shearstressmag']].mean() 
+        # average all points in each ring. rings are sorted by z, so each survival object gets its steps in order
+    return rings, nz
+        
 def survivalCalc(folder:str, time:float=2.5, a:float=10**-2, b:float=0.5, c:float=0.5, zunits:str='mm', dr:float=0.05, fcrit:float=0.9, volume:bool=True, xhalf:bool=True, **kwargs):
     '''calculate what cells will survive the process, if S=exp(-a*tau^b*t^c). 
     time is the time at which to collect stress data
@@ -138,38 +190,35 @@ def survivalCalc(folder:str, time:float=2.5, a:float=10**-2, b:float=0.5, c:floa
     dr is the spacing between relative radial positions to group by, as a fraction
     fcrit is the min fraction of points required to get returned. Otherwise too many points were skipped, and the measurement is not valid
     volume = True to use the whole volume of the nozzle, if there is a file. otherwise, use a slice collected from the center of the nozzle
+    ringsCache is an optional dictionary to store rings from survivalRings in, so calls with different a,b,c only import the points once
     '''
     
-    if volume:
-        df,units = intm.importPtsNoz(folder, time) # get points in nozzle
+    key = (folder, time, dr, volume, xhalf)
+    ringsCache = kwargs.get('ringsCache', None)
+    if ringsCache is not None and key in ringsCache:
+        rings, nz = ringsCache[key]
     else:
-        df,units = intm.importSliceNoz(folder, time) # get points in nozzle
-    if len(df)==0:
+        rings, nz = survivalRings(folder, time, dr, volume, xhalf)
+        if ringsCache is not None:
+            ringsCache[key] = (rings, nz)
+    if rings is None:
         return [] 
-    
-    df = intm.takePlane(df, folder, dr=dr, xhalf=xhalf) # take just the middle plane
 
     if 'rbarlist' in kwargs:
         rbarlist = kwargs['rbarlist']
     else:
         rbarlist = np.arange(0, 1, dr)                            # normalized radius evenly spaced from 0 to 1
         rbarlist = [round(rbar,5) for rbar in rbarlist]           # round to avoid floating point error
-    rz = dict([[rbar,survival(rbar, a, b, c)] for rbar in rbarlist]) # table of survival as a function of r/r0 and z
-    zlist = list(df.z.unique())
-    zlist.sort()                  # put in order, where negative values are at top
-    for z in zlist:
-        df0 = df[df.z==z]         # select points in this plane
-        for rbar in rbarlist:
-            df1 = df0[(df0['rbar']==rbar)&(df0['magu']>0)]
-            if len(df1)>0:
-                row = df1.mean() # average all points
-                rz[rbar].addStep(row)
+    rz = dict([[rbar,survival(rbar, a, b, c, nsteps=nz)] for rbar in rbarlist]) # table of survival as a function of r/r0 and z
+    for z, rbar, x, v, tau in zip(*(rings[s].to_numpy() for s in ['z', 'rbar', 'x', 'magu', 'shearstressmag'])):
+        if rbar in rz:
+            rz[rbar].addStep(z, x, v, tau)
                 
     # remove series that are too short
     remlist = []
     for key in rz.keys():
 #         if len(rz[key].zlist)<0.9*len(zlist):
-        if len(rz[key].zlist)<0.75*len(zlist):
+        if rz[key].n<0.75*nz:
             remlist.append(key)
     for key in remlist:
         rz.pop(key)
@@ -183,18 +232,21 @@ def survivalCalc(folder:str, time:float=2.5, a:float=10**-2, b:float=0.5, c:floa
             
     return rz
 
+def survivalArrays(rz:dict) -> Tuple[np.array, np.array]:
+    '''get arrays of the normalized radii and the final survival at each radius, given a dictionary rz that holds survival objects'''
+    rbars = np.array(list(rz), dtype=float)
+    totalI = np.array([rz[rbar].totalI for rbar in rz], dtype=float)
+    return rbars, totalI
+
 def survivalRateRZ(rz:dict, dr) -> float:
     '''get the survival rate, given a dictionary rz that holds survival objects
     dr is the spacing between relative radial positions to group by, as a fraction
     '''
-    weightedsum = 0
-    weight = 0
-    for rbar in rz:
-        area = (rbar**2 - (rbar-dr)**2)
-        weightedsum = weightedsum + rz[rbar].totalI*area # survival * area of ring
-        weight = weight + area
+    rbars, totalI = survivalArrays(rz)
+    area = rbars**2 - (rbars-dr)**2   # area of each ring
+    weight = area.sum()
     if weight>0:
-        return weightedsum/weight
+        return (totalI*area).sum()/weight   # survival weighted by area of ring
     else:
         return 0
     
@@ -220,10 +272,11 @@ def survivalzPlot(rz:dict, xvar:str, axs:np.array, zunits:str, cm):
             xlist = rz[rbar].zlist
         else:
             xlist = rz[rbar].tlist
-        xlist = xlist[1:]
+        n = rz[rbar].n
+        xlist = xlist[1:n]
         if len(xlist)>0: 
             for i,yl in enumerate(['vlist', 'taulist', 'Ilist']):
-                ylist = getattr(rz[rbar], yl)[1:]
+                ylist = getattr(rz[rbar], yl)[1:n]
                 axs[i].plot(xlist, ylist, c=cm(rbar), linewidth=0.75)
                 xi = int(len(xlist)/2)
                 axs[i].text(xlist[xi], ylist[xi], rbar, color=cm(rbar), horizontalalignment='center', verticalalignment='top') 
@@ -250,7 +303,7 @@ def survivalzPlot(rz:dict, xvar:str, axs:np.array, zunits:str, cm):
         
     
         
-def survivalrPlot(folder:str, ax, time:float=2.5, a:float=10**-3, b:float=0.5, c:float=0.5, dr:float=0.05, xlabel:bool=True, ylabel:bool=True, fontsize:int=8, **kwargs):
+def survivalrPlot(folder:str, ax, time:float=2.5, a:float=10**-3, b:float=0.5, c:float=0.5, dr:float=0.05, xlabel:bool=True, ylabel:bool=True, fontsize:int=8, rz:dict=None, square:bool=True, **kwargs):
     '''plot cell survival as a function of normalized radius within the nozzle
     ax is the axis to plot on
     time is the time at which to collect stress data
@@ -258,13 +311,12 @@ def survivalrPlot(folder:str, ax, time:float=2.5, a:float=10**-3, b:float=0.5, c
     dr is the spacing between relative radial positions, as a fraction
     xlabel = True to label the x axis
     ylabel = True to label the y axis
+    rz is the output of survivalCalc, if it has already been calculated
+    square = True to make the axis square. use False when plotting multiple lines on the same axis, and set it once at the end
     '''
-    xlist = []
-    ylist = []
-    rz = survivalCalc(folder, time=time, a=a, b=b, c=c, dr=dr, **kwargs)
-    for rbar in rz:
-        xlist.append(rbar)
-        ylist.append(rz[rbar].totalI)
+    if rz is None:
+        rz = survivalCalc(folder, time=time, a=a, b=b, c=c, dr=dr, **kwargs)
+    xlist, ylist = survivalArrays(rz)
     if not 'color' in kwargs:
         color='black'
     else:
@@ -277,50 +329,84 @@ def survivalrPlot(folder:str, ax, time:float=2.5, a:float=10**-3, b:float=0.5, c
         ax.set_xlabel('Radius/nozzle radius', fontsize=fontsize)
     if ylabel:
         ax.set_ylabel('Surviving cells/initial cells', fontsize=fontsize)
-    setSquare(ax)
+    if square:
+        setSquare(ax)
     return rz
 
 
-    
-def survivalRMulti(topFolder:str, axs, cvar:str='nozzle_angle', time:float=2.5, a:float=10**-3, b:float=0.5, c:float=0.5, dr:float=0.05, xlabel:bool=True, ylabel:bool=True, fontsize:int=8, **kwargs):
-    '''plot cell survival as a function of normalized radius within the nozzle, for multiple sims. axs should be an array of 2 axes
-    topFolder holds multiple simulations
-    axs is the list of axes to plot on
-    cvar is the variable to color by
-    time is the time at which to collect stress data
-    a,b,c are survival model parameters
-    dr is the spacing between relative radial positions, as a fraction
-    xlabel = True to label the x axis
-    ylabel = True to label the y axis
-    '''
-    
-    plt.rc('font', size=fontsize)
-    
+def survivalFolderList(topFolder:str, cvar:str='nozzle_angle', **kwargs) -> Tuple[pd.DataFrame, dict]:
+    '''get a table of the simulation folders in topFolder and their values of cvar, sorted by cvar, and the units of the variables. 
+    the table is empty if there are no matching folders'''
     folders = fp.caseFolders(topFolder)       # all sims in folder
     folders, _ = listTPvalues(folders, **kwargs) # remove any values that don't match
     
-    cm = sns.color_palette('viridis', n_colors=len(folders)) # uses viridis color scheme
-    
     flist = []
+    u = {}
     for i,folder in enumerate(folders):
         le, u = extractTP(folder, units=True)
         nz = round(float(le[cvar]), 10)
         flist.append({'folder':folder, 'cvar':nz})
         
     if len(flist)==0:
-        return
+        return pd.DataFrame(flist), u
         
     flist = pd.DataFrame(flist)
     flist.sort_values(by='cvar', inplace=True)
     flist.reset_index(drop=True, inplace=True)
     flist['cvar'] = expFormatList(list(flist['cvar']))
+    return flist, u
+
+def survivalCalcTask(task:Tuple[str, dict]) -> Tuple[Union[dict, list], dict]:
+    '''run survivalCalc for one folder in a process pool. task is (folder, keyword arguments for survivalCalc), where the ringsCache holds any rings already imported for this folder. 
+    returns the survival dictionary and the ringsCache, so the caller can keep the imported rings'''
+    folder, kw = task
+    rz = survivalCalc(folder, **kw)
+    return rz, kw['ringsCache']
+    
+def survivalRMulti(topFolder:str, axs, cvar:str='nozzle_angle', time:float=2.5, a:float=10**-3, b:float=0.5, c:float=0.5, dr:float=0.05, xlabel:bool=True, ylabel:bool=True, fontsize:int=8, folderList:Tuple[pd.DataFrame, dict]=None, ringsCache:dict=None, processes:int=1, **kwargs) -> Tuple[pd.DataFrame, dict]:
+    '''plot cell survival as a function of normalized radius within the nozzle, for multiple sims. axs should be an array of 2 axes
+    topFolder holds multiple simulations
+    axs is the list of axes to plot on
+    cvar is the variable to color by
+    time is the time at which to collect stress data
+    a,b,c are survival model parameters
+    dr is the spacing between relative radial positions, as a fraction
+    xlabel = True to label the x axis
+    ylabel = True to label the y axis
+    folderList is the output of survivalFolderList, if it has already been collected
+    ringsCache is an optional dictionary of imported points to reuse, as in survivalCalc
+    processes is the number of processes to use to calculate survival in the folders. the plotting is always done in this process
+    returns the folderList, so it can be reused for other weights
+    '''
     
+    plt.rc('font', size=fontsize)
     
-    for i,row in flist.iterrows():
-        nz = row['cvar']
+    if folderList is None:
+        folderList = survivalFolderList(topFolder, cvar=cvar, **kwargs)
+    flist, u = folderList
+    if len(flist)==0:
+        return folderList
+    
+    cm = viridisPalette(len(flist)) # uses viridis color scheme
+    
+    folders = list(flist['folder'])
+    rzlist = [None]*len(folders)
+    if processes>1 and len(folders)>1:
+        # calculate survival for all of the folders at once, then plot them in order
+        if ringsCache is None:
+            ringsCache = {}
+        tasks = [(folder, {**kwargs, 'a':a, 'b':b, 'c':c, 'dr':dr
+                           , 'ringsCache':{key:val for key,val in ringsCache.items() if key[0]==folder}}) for folder in folders]
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(survivalCalcTask, tasks)
+        for i,(rz,rc) in enumerate(results):
+            rzlist[i] = rz
+            ringsCache.update(rc)
+    
+    for i,(folder,nz) in enumerate(zip(folders, flist['cvar'])):
         if cvar=='nozzle_angle':
             nz = f'{int(nz)}$\degree$'
-        rz = survivalrPlot(row['folder'], axs[0], a=a, dr=dr, b=b, c=c, color=cm[i], label=nz, ylabel=ylabel, xlabel=xlabel, **kwargs)
+        rz = survivalrPlot(folder, axs[0], a=a, dr=dr, b=b, c=c, color=cm[i], label=nz, ylabel=ylabel, xlabel=xlabel, ringsCache=ringsCache, rz=rzlist[i], square=False, **kwargs)
         rate = survivalRateRZ(rz, dr)
         axs[1].scatter([nz], [rate], color=cm[i])
        
@@ -328,19 +414,22 @@ def survivalRMulti(topFolder:str, axs, cvar:str='nozzle_angle', time:float=2.5,
         axs[1].set_xlabel(f'{unitName(cvar)} ({u[cvar]})', fontsize=fontsize)
     if ylabel:
         axs[1].set_ylabel('Surviving cells/initial cells', fontsize=fontsize)
-    setSquare(axs[1])
+    for ax in axs:
+        setSquare(ax)
 
     axs[0].set_title(survivalEqLabel(a,b,c), fontsize=fontsize)
+    return folderList
     
     
 
     
-def survivalRMultiRow(topFolder:str, exportFolder:str, fontsize:int=8, export:bool=True, overwrite:bool=False, **kwargs):
+def survivalRMultiRow(topFolder:str, exportFolder:str, fontsize:int=8, export:bool=True, overwrite:bool=False, processes:int=1, **kwargs):
     '''plot cell survival as a function of radius, at three weights of the equation
     topFolder holds multiple simulations
     exportFolder is the folder to export figures to
     export=True to export images to file
     overwrite=True to overwrite existing files
+    processes is the number of processes to use to calculate survival in the folders
     '''
     
     labels = ['survivalMulti']
@@ -353,8 +442,10 @@ def survivalRMultiRow(topFolder:str, exportFolder:str, fontsize:int=8, export:bo
         for ax in axs[1]:
             ax.set_xscale('log')
     plt.rc('font', size=fontsize) 
+    ringsCache = {}   # import the points for each folder once, and reuse them for all of the weights
+    folderList = None   # the folders are the same for all of the weights, so only list them for the first weight
     for i,d in enumerate(weights(**kwargs)):
-        survivalRMulti(topFolder, [axs[0][i], axs[1][i]], a=d['a'], b=d['b'], c=d['c'], **kwargs)
+        folderList = survivalRMulti(topFolder, [axs[0][i], axs[1][i]], a=d['a'], b=d['b'], c=d['c'], ringsCache=ringsCache, folderList=folderList, processes=processes, **kwargs)
     subFigureLabels(axs, inside=False)
     fig.tight_layout()
     
@@ -458,39 +549,40 @@ def stressInPlane(df0:pd.DataFrame) -> float:
     return stress
 
 
-def shearStressCalcVolume(folder:str, time:float, zunits:str, z0:float) -> Tuple[List[float], List[float]]: # RG
+def shearStressCalcVolume(folder:str, time:float, zunits:str, z0:float, ptsCache:dict=None) -> Tuple[Union[list, np.array], Union[list, np.array]]: # RG
     '''calculate mean shear stress across the length of the nozzle, from all points in nozzle
     time is the time at which we collect the shear stress
     zunits is 'mm' or any parameter in legend, e.g. 'nozzle_inner_width'
     z0 is the bottom z position of the nozzle, or any value in mm to set the z position relative to
+    ptsCache is an optional dictionary of imported points, as in importNoz
     '''
     
-    df,units = intm.importPtsNoz(folder, time) # get points in nozzle
+    df,units = importNoz(folder, time, True, ptsCache=ptsCache) # get points in nozzle
     if len(df)==0:
         return [], []
     
-    vals = df.groupby(by='z').mean()['shearstressmag']
+    vals = df.groupby(by='z')['shearstressmag'].mean()   # only average the column we need
     
     if len(vals)==0:
         return [],[]
     
-    xlist = list(z0 - vals.index)
-    ylist = list(vals)
+    xlist = z0 - vals.index.to_numpy()
     if not zunits=='mm':
         le = fp.legendUnique(folder)
-        xlist = [i/float(le[zunits]) for i in xlist]
+        xlist = xlist/float(le[zunits])
 
-    return xlist, ylist
+    return xlist, vals.to_numpy()
 
 
-def shearStressCalcSlice(folder:str, time:float, zunits:str) -> Tuple[List[float], List[float]]: 
+def shearStressCalcSlice(folder:str, time:float, zunits:str, ptsCache:dict=None) -> Tuple[List[float], List[float]]: 
     '''Calculates mean shear stress across the length of the nozzle, from slice
     folder is the folder to do calculations on
     time is the time at which to calculate the shear stress
     zunits is 'mm' or any parameter in legend, e.g. 'nozzle_inner_width'
+    ptsCache is an optional dictionary of imported points, as in importNoz
     '''
     
-    df,units = intm.importSliceNoz(folder, time) # get points in nozzle
+    df,units = importNoz(folder, time, False, ptsCache=ptsCache) # get points in nozzle
     if len(df)==0:
         return [], []
     if not 'shearstressmag' in df:
@@ -521,19 +613,17 @@ def shearStressCalcSlice(folder:str, time:float, zunits:str) -> Tuple[List[float
     return zlist, stresslist
 #-------------------
     
-def nozzleLineTrace(folder:str, time:float, zabove:float, zunits:str='mm', volume:bool=False) -> pd.DataFrame:
+def nozzleLineTrace(folder:str, time:float, zabove:float, zunits:str='mm', volume:bool=False, ptsCache:dict=None) -> pd.DataFrame:
     '''Calculates mean shear stress across the width of the nozzle
     folder is the folder to do calculations on
     time is the time at which to collect the stress
     zabove is the z position relative to the bottom of the nozzle, in units of zunits
     zunits is 'mm' or any parameter in legend, e.g. 'nozzle_inner_width'
     volume = True to use the whole volume of the nozzle, if there is a file. otherwise, use a slice collected from the center of the nozzle
+    ptsCache is an optional dictionary of imported points, as in importNoz
     '''
     
-    if volume:
-        df,units = intm.importPtsNoz(folder, time) # get points in nozzle
-    else:
-        df,units = intm.importSliceNoz(folder, time) # get points in nozzle
+    df,units = importNoz(folder, time, volume, ptsCache=ptsCache)
     
     if len(df)==0:
         return []
@@ -542,25 +632,29 @@ def nozzleLineTrace(folder:str, time:float, zabove:float, zunits:str='mm', volum
     
     df = intm.takePlane(df, folder, dr=0.001, xhalf=True) # add rbar column
 
+    con = 1
     if not zunits==units['z']:
         # convert z units
         if zunits in le:
             con = float(le[zunits])
-            df['z'] = [i/con for i in df['z']]
             
     if zabove>0:
         zabove=-zabove
     
-    zvar = intm.closest(df['z'].unique(), zabove) # get exact z val
-    df = df[(df['z']==zvar)] # get points at that z val
+    # find the z val on the unique values, so only the points at that z val need to be converted
+    zu = df['z'].unique()
+    zraw = zu[np.abs(zu/con - zabove).argmin()] # get exact z val, in the original units
+    df = df[df['z'].to_numpy()==zraw].copy() # get points at that z val
+    if not con==1:
+        df['z'] = df['z']/con
 
     # convert kinematic viscosity to dynamic
     rho = float(le['ink_rho'])    
     if 'nu_ink' in df:
-        df['nu_ink'] = [rho*nu for nu in df['nu_ink']]
+        df['nu_ink'] = df['nu_ink']*rho
 
     md = float(le['nozzle_center_x_coord'])
-    df['x'] = [x-md for x in df['x']]
+    df['x'] = df['x']-md
     
     df.sort_values(by='x', inplace=True)
         
@@ -577,8 +671,8 @@ def getListsFromTrace(row:pd.Series, zstress:pd.DataFrame, xvar:str, yvar:str, c
     '''
     if len(zstress)>0:
         theta = row[cvar]    
-        xlist = list(zstress[xvar])
-        ylist = list(zstress[yvar])
+        xlist = zstress[xvar].to_numpy()
+        ylist = zstress[yvar].to_numpy()
         if yvar=='shearstressz':
             li = int(len(zstress)/2)
         elif yvar=='shearstressmag':
@@ -592,7 +686,7 @@ def getListsFromTrace(row:pd.Series, zstress:pd.DataFrame, xvar:str, yvar:str, c
         return '', 0, [], []
     
 
-def getDataWithinNozzle(xvar:str, yvar:str, cvar:str, row:pd.Series, time:float, zabove:float, zunits:str, volume:bool):
+def getDataWithinNozzle(xvar:str, yvar:str, cvar:str, row:pd.Series, time:float, zabove:float, zunits:str, volume:bool, ptsCache:dict=None):
     '''get point data within the nozzle for the intended metrics
     xvar is the variable to plot on the x axis
     yvar is the variable to plot on the y axis
@@ -602,19 +696,20 @@ def getDataWithinNozzle(xvar:str, yvar:str, cvar:str, row:pd.Series, time:float,
     zabove is the z position relative to the bottom of the nozzle, in units of zunits
     zunits is 'mm' or any parameter in legend, e.g. 'nozzle_inner_width'
     volume = True to use the whole volume of the nozzle, if there is a file. otherwise, use a slice collected from the center of the nozzle
+    ptsCache is an optional dictionary of imported points, as in importNoz
     '''
     # get data
     if yvar=='shearstressz':
         theta = row[cvar]
         if not volume:
-            xlist,ylist = shearStressCalcSlice(row['folder'], time, zunits)
+            xlist,ylist = shearStressCalcSlice(row['folder'], time, zunits, ptsCache=ptsCache)
         else:
             z0 = row['nozzle_bottom_coord']
-            xlist,ylist = shearStressCalcVolume(row['folder'], time, zunits, z0)
+            xlist,ylist = shearStressCalcVolume(row['folder'], time, zunits, z0, ptsCache=ptsCache)
         li = int(len(xlist)/2)
         zstress = []
     else:
-        zstress = nozzleLineTrace(row['folder'], time, zabove, zunits=zunits, volume=volume)
+        zstress = nozzleLineTrace(row['folder'], time, zabove, zunits=zunits, volume=volume, ptsCache=ptsCache)
         theta, li, xlist, ylist = getListsFromTrace(row, zstress, xvar, yvar, cvar)
     return theta, li, zstress, xlist, ylist
 
@@ -640,7 +735,7 @@ def plotWithinNozzle(xlist:list, ylist:list, theta:float, color, legendloc:str,
             ha = 'center'
         ax.text(x0, y0, clabel, color=color, horizontalalignment=ha, verticalalignment='top') 
 
-def withinNozzleFolder(i:int, row:pd.Series, time:float, zabove:float, ax, yvar:str, cvar:str, cm, legendloc:str='overlay', zunits:str='mm', xvar:str='x', volume:bool=False, zstress:List=[], **kwargs) -> None:
+def withinNozzleFolder(i:int, row:pd.Series, time:float, zabove:float, ax, yvar:str, cvar:str, cm, legendloc:str='overlay', zunits:str='mm', xvar:str='x', volume:bool=False, zstress:List=[], ptsCache:dict=None, **kwargs) -> None:
     '''get data from inside the nozzle and plot it for a single folder
     i is the row number, used for determining color
     row holds metadata about the simulation
@@ -654,21 +749,39 @@ def withinNozzleFolder(i:int, row:pd.Series, time:float, zabove:float, ax, yvar:
     xvar is the variable to plot on the x axis
     volume = True to use the whole volume of the nozzle, if there is a file. otherwise, use a slice collected from the center of the nozzle
     if zstress is empty, this calculates the stress list using getDataWithinNozzle, otherwise it uses the already collected zstress
+    ptsCache is an optional dictionary of imported points, as in importNoz
     '''
-    xlist = []
+    theta, li, zstress, xlist, ylist = withinNozzleData(row, time, zabove, yvar, cvar, zunits, xvar, volume, zstress, ptsCache=ptsCache)
+    plotNozzleTrace(i, row, ax, cvar, cm, legendloc, theta, li, xlist, ylist)
+    return zstress
+
+def withinNozzleData(row:dict, time:float, zabove:float, yvar:str, cvar:str, zunits:str, xvar:str, volume:bool, zstress:List, ptsCache:dict=None) -> Tuple[Any, int, Union[pd.DataFrame, List], list, list]:
+    '''get the trace for a single folder and yvar, as described in withinNozzleFolder. returns theta, li, zstress, xlist, ylist'''
     if len(zstress)==0:
-        theta, li, zstress, xlist, ylist = getDataWithinNozzle(xvar, yvar, cvar, row, time, zabove, zunits, volume)
+        return getDataWithinNozzle(xvar, yvar, cvar, row, time, zabove, zunits, volume, ptsCache=ptsCache)
     else:
         theta, li, xlist, ylist = getListsFromTrace(row, zstress, xvar, yvar, cvar)
-
+        return theta, li, zstress, xlist, ylist
+    
+def plotNozzleTrace(i:int, row:dict, ax, cvar:str, cm, legendloc:str, theta:Any, li:int, xlist:list, ylist:list) -> None:
+    '''plot a trace from withinNozzleData for a single folder. i is the row number, used for determining color'''
     if len(xlist)==0:
         folder = row['folder']
         logging.warning(f'No data collected in {folder}')
-        return zstress
-    
+        return
     plotWithinNozzle(xlist, ylist, theta, cm[i], legendloc, ax, cvar, li)
-        
-    return zstress
+    
+def withinNozzleTask(task:Tuple[dict, float, float, List[str], str, str, str, bool]) -> List[Tuple[Any, int, list, list]]:
+    '''get the traces for a single folder for all yvars in a process pool. task is (row, time, zabove, yvars, cvar, zunits, xvar, volume), as described in withinNozzleFolder. 
+    returns a list of (theta, li, xlist, ylist), one for each yvar'''
+    row, time, zabove, yvars, cvar, zunits, xvar, volume = task
+    zstress = []
+    ptsCache = {}   # the stress along z and the trace across the nozzle use the same points
+    traces = []
+    for yvar in yvars:
+        theta, li, zstress, xlist, ylist = withinNozzleData(row, time, zabove, yvar, cvar, zunits, xvar, volume, zstress, ptsCache=ptsCache)
+        traces.append((theta, li, xlist, ylist))
+    return traces
     
     
 def labelNozAxs(ax, yvar:str, zunits:str, xvar:str, zabove:float, time:float, legendloc:str, **kwargs):
@@ -710,15 +823,16 @@ def labelNozAxs(ax, yvar:str, zunits:str, xvar:str, zabove:float, time:float, le
         ax.legend(loc='lower left', bbox_to_anchor=(0,1))
         
 
-def withinNozzle(folders:List[str], time:float, zabove:float, axs, cvar:str, yvars:str, legendloc:str='overlay', zunits:str='mm', xvar:str='x', volume:bool=False,  **kwargs) -> None:
+def withinNozzle(folders:List[str], time:float, zabove:float, axs, cvar:str, yvars:str, legendloc:str='overlay', zunits:str='mm', xvar:str='x', volume:bool=False, processes:int=1, **kwargs) -> None:
     '''plot line traces of value yvars across the nozzle as a function of xvar at position zabove relative to the bottom of the nozzle in zunits and time time, on axes axs, coloring the lines by variable cvar
      zunits is 'mm' or any parameter in legend, e.g. 'nozzle_inner_width'
     volume=True to use points from the whole nozzle volume, False to use only a slice at y=0
+    processes is the number of processes to use to collect the traces. the plotting is always done in this process
     '''
     _, u = extractTP(folders[0], units=True) # get units
 
     if not 'cm' in kwargs:
-        cm = sns.color_palette('viridis', n_colors=len(folders)) # uses viridis color scheme
+        cm = viridisPalette(len(folders)) # uses viridis color scheme
     else:
         cm = kwargs['cm']
     
@@ -728,10 +842,20 @@ def withinNozzle(folders:List[str], time:float, zabove:float, axs, cvar:str, yva
     tplist[cvar] = expFormatList(tplist[cvar])
     maxy = 0
     
-    for i,row in tplist.iterrows():
-        zstress =  []
-        for j,yvar in enumerate(yvars):
-            zstress = withinNozzleFolder(i, row, time, zabove, axs[j], yvar, cvar, cm, legendloc=legendloc, zunits=zunits, xvar=xvar, volume=volume, zstress = zstress, **kwargs)
+    rows = tplist.to_dict('records')
+    if processes>1 and len(rows)>1:
+        # collect the traces for all of the folders at once, then plot them in order
+        with multiprocessing.Pool(processes) as pool:
+            traces = pool.map(withinNozzleTask, [(row, time, zabove, yvars, cvar, zunits, xvar, volume) for row in rows])
+        for i,row in enumerate(rows):
+            for j,trace in enumerate(traces[i]):
+                plotNozzleTrace(i, row, axs[j], cvar, cm, legendloc, *trace)
+    else:
+        for i,row in enumerate(rows):
+            zstress =  []
+            ptsCache = {}   # the stress along z and the trace across the nozzle use the same points
+            for j,yvar in enumerate(yvars):
+                zstress = withinNozzleFolder(i, row, time, zabove, axs[j], yvar, cvar, cm, legendloc=legendloc, zunits=zunits, xvar=xvar, volume=volume, zstress = zstress, ptsCache=ptsCache, **kwargs)
             
     # add labels
     for j,yvar in enumerate(yvars):
@@ -750,7 +874,7 @@ def setRanges(axs, **kwargs):
     axs[2].set_xlim([0,1])
     
 def withinNozzle0(topFolder:str, exportFolder:str, time:float, zabove:float, zunits:str='mm', cvar:str='nozzle_angle'
-                  , overwrite:bool=False, export:bool=True, fontsize:int=8, **kwargs):
+                  , overwrite:bool=False, export:bool=True, fontsize:int=8, processes:int=1, **kwargs):
     '''plots line traces within the nozzle at a given z position and time. 
     topfolder is the folder holding the simulations. you can filter the folder using **kwargs, as described in plot_general.listTPvalues
     exportFolder is the folder to export figures to
@@ -760,6 +884,7 @@ def withinNozzle0(topFolder:str, exportFolder:str, time:float, zabove:float, zun
     cvar is the variable to color by
     overwrite True to overwrite existing files
     export True to export figures
+    processes is the number of processes to use to collect the traces
     '''
     
 
@@ -784,7 +909,7 @@ def withinNozzle0(topFolder:str, exportFolder:str, time:float, zabove:float, zun
             for ax in [axs[0], axs[1]]:
                 ax.set_yscale('log')
     
-    withinNozzle(folders, time, zabove, axs, cvar, ['shearstressz', 'shearstressmag', 'magu'], zunits=zunits, **kwargs) # plot the values on the axis
+    withinNozzle(folders, time, zabove, axs, cvar, ['shearstressz', 'shearstressmag', 'magu'], zunits=zunits, processes=processes, **kwargs) # plot the values on the axis
    
     setRanges(axs, **kwargs)
 
@@ -819,7 +944,7 @@ def analyticalStress(vf:float, di:float, visc:float, theta:float, z:float, rlist
 def analyticalColors(l:list, **kwargs) -> list:
     '''get a list of colors'''
     if not 'cm' in kwargs:
-        cm = sns.color_palette('viridis', n_colors=len(l)) # uses viridis color scheme
+        cm = viridisPalette(len(l)) # uses viridis color scheme
     else:
         cm = kwargs['cm']
     return cm
@@ -66,10 +66,14 @@ class folderPlots(varPlots):
         return dict([[f'{s}index', row[f'{s}index']] for s in ['x', 'y', 'c', 'splitx', 'splity']])
     
     def getXYRow(self, row:pd.Series) -> dict:
-        '''get the x,y,color, and split of the folder from the row in self.filedf'''
+        '''get the x,y,color, and split of the folder from the row in self.filedf. 
+        if self.filedf already has a color column, e.g. from valuePlot.findSquareColors, use that instead of finding the color again'''
         x0 = self.xmlist[row['xindex']]
         y0 = self.ymlist[row['yindex']]
-        color = self.colors.getColor(row['cvar'])
+        if 'color' in row:
+            color = row['color']
+        else:
+            color = self.colors.getColor(row['cvar'])
         axcol = row['splitxindex']
         axrow = row['splityindex'] 
         ax = self.axs[axrow][axcol]
@@ -52,8 +52,8 @@ class superSummaryPlot(multiPlot):
         self.referenceStyle=referenceStyle
         self.refLoc = refLoc
         super().__init__(topFolder, exportFolder, xvar, yvar, **kwargs)  
-        self.ss = superSummary(topFolder, ssFolder, time, xbehind, xunits)
-        self.ssRef = superSummary(topFolder, ssFolder, time, -3, 'niw')   # get a reference slice for the initial values
+        self.ss = superSummary(topFolder, ssFolder, time, xbehind, xunits, **kwargs)
+        self.ssRef = superSummary(topFolder, ssFolder, time, -3, 'niw', **kwargs)   # get a reference slice for the initial values
         
         self.ss.importFile()   # import or create values
         self.ssRef.importFile()
@@ -9,7 +9,9 @@ import logging
 import traceback
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.collections import PatchCollection
 from plot.colors import plotColors
 
 # local packages
@@ -57,6 +59,7 @@ class valuePlot(comboPlot):
         self.timeplot = timeplot
         self.labelLocs = labelLocs
         self.findValues(**kwargs) # find all of the values we are going to plot
+        self.findCaptions()
         
         
         # plot circles in order of value
@@ -67,11 +70,14 @@ class valuePlot(comboPlot):
         if self.shape=='square':
             self.setColors()
         spacing = labelFreq 
+        self.squares = {}   # squares to draw on each axis, as lists of patches and colors
         # iterate through folders and plot data
-        for i,row in self.filedf.iterrows():
+        for i,row in zip(self.filedf.index, self.filedf.to_dict('records')):
+            # plain dictionaries are much faster to build than the Series from iterrows, and index the same way
             self.plotFolder(row, caption=i%spacing==0)
             
         if self.shape=='square':
+            self.drawSquares()
             self.valueLegend(**kwargs)
             
         self.clean()
@@ -91,10 +97,8 @@ class valuePlot(comboPlot):
     
     def findValues(self, **kwargs) -> str:
         '''find all of the values we are going to plot'''
-        for i,row in self.filedf.iterrows():
-            fs = self.fstats[row['folder']]
-            val = self.metaItem(fs)
-            self.filedf.loc[i, 'value'] = val
+        self.filedf['value'] = [self.metaItem(self.fstats[folder]) for folder in self.filedf['folder']]
+            # collect the values first and add the column at once, instead of setting one cell per folder
         if 'minval' in kwargs:
             self.minval = kwargs['minval']
         else:
@@ -118,6 +122,15 @@ class valuePlot(comboPlot):
                                  , minval=self.minval, maxval=self.maxval, byIndices=False)
         self.legend.colors = self.colors
         self.filedf.loc[:, 'cvar'] = self.filedf.value
+        self.findSquareColors()
+        
+    def findSquareColors(self) -> None:
+        '''get the square color and a readable text color for all of the values at once'''
+        colors = [self.colors.getColor(val) for val in self.filedf['value']]
+        rgba = matplotlib.colors.to_rgba_array(colors)
+        lum = rgba[:,:3] @ np.array([0.2126, 0.7152, 0.0722])   # brightness of each color
+        self.filedf['color'] = colors
+        self.filedf['txtcolor'] = np.where(lum>0.4, 'black', 'white')
         
         
     def scale(self, row:pd.Series) -> float:
@@ -145,6 +158,15 @@ class valuePlot(comboPlot):
         else:
             caption = '%1.2f'%(val)
         return caption
+    
+    def findCaptions(self) -> None:
+        '''get the captions for all of the values at once, using the same formats as caption'''
+        vals = self.filedf['value'].to_numpy(dtype=float)
+        captions = np.where(vals>1000, np.char.mod('%.2e', vals)
+                            , np.where((vals>10)|(self.maxval>100), np.char.mod('%2.0f', vals), np.char.mod('%1.2f', vals)))
+        captions = captions.astype(object)
+        captions[np.isnan(vals)] = ''
+        self.filedf['caption'] = captions
 
         
     def plotFolder(self, row:pd.Series, caption:bool) -> None:
@@ -165,18 +187,21 @@ class valuePlot(comboPlot):
             
     def plotSquare(self, row:pd.Series, pos:dict, caption:bool, scale:float) -> None:
         '''plot a square colored by value, with a caption'''
-        color = self.colors.getColor(row['value'])
-        box = plt.Rectangle([pos['x0']-self.dx,pos['y0']-self.dx], self.dx*2, self.dx*2, color=color, ec=None)
-        pos['ax'].add_artist(box)
+        color = row['color']
+        box = plt.Rectangle([pos['x0']-self.dx,pos['y0']-self.dx], self.dx*2, self.dx*2)
+        if not pos['ax'] in self.squares:
+            self.squares[pos['ax']] = ([], [])
+        self.squares[pos['ax']][0].append(box)
+        self.squares[pos['ax']][1].append(color)
         if caption:
-            txt = self.caption(row)
-            # calculate brightness of color
-            l = 0.2126 * color[0] + 0.7152 * color[1] + 0.0722 * color[2]
-            if l>0.4:
-                txtcolor = 'black'
-            else:
-                txtcolor = 'white'
-            pos['ax'].text(pos['x0'], pos['y0'], txt, horizontalalignment='center', verticalalignment='center', c=txtcolor)
+            txt = row['caption']
+            pos['ax'].text(pos['x0'], pos['y0'], txt, horizontalalignment='center', verticalalignment='center', c=row['txtcolor'])
+            
+    def drawSquares(self) -> None:
+        '''draw the squares from plotSquare, as one collection per axis'''
+        for ax, (boxes, colors) in self.squares.items():
+            pc = PatchCollection(boxes, facecolors=colors, edgecolors=colors, linewidths=matplotlib.rcParams['patch.linewidth'])
+            ax.add_collection(pc, autolim=False)
             
     def getRadius(self, scale:float) -> float:
         '''get the radius of the circle to plot'''
@@ -205,7 +230,7 @@ class valuePlot(comboPlot):
         circle = plt.Circle([pos['x0'], pos['y0']], radius, color=color, fill=False) # create the circle
         pos['ax'].add_artist(circle)                                         # put the circle on the plot
         if caption:
-            txt = self.caption(row)
+            txt = row['caption']
             if self.labelLocs=='inside':
                 self.labelInside(pos, row, txt, color)
             elif self.labelLocs=='outside':
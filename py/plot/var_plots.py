@@ -105,7 +105,7 @@ class varPlots:
             return True
         if overwrite:
             return True
-        return os.path.exists(self.fnc.png())
+        return self.fnc.pngExists()
         
     def exportIm(self, **kwargs):
         '''export images'''
@@ -289,12 +289,12 @@ class XSPlot(comboPlot):
         if os.path.exists(p):
             return p
         else:
-            for f1 in os.listdir(topFolder):
-                f1full = os.path.join(topFolder, f1)
-                if os.path.isdir(f1full) and not fp.isSimFolder(f1full) and not f1 in ['mesh', 'geometry']:
-                    r = self.findRef(fs, f1full)
-                    if len(r)>0:
-                        return r
+            with os.scandir(topFolder) as it:
+                for entry in it:
+                    if entry.is_dir() and not entry.name in ['mesh', 'geometry'] and not fp.isSimFolder(entry.path):
+                        r = self.findRef(fs, entry.path)
+                        if len(r)>0:
+                            return r
             return ''
         
     def plotFolder(self, row) -> None:
@@ -12,6 +12,7 @@ import re
 from typing import List, Dict, Tuple, Union, Any
 import logging
 import traceback
+import json
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -28,6 +29,66 @@ from points.slice_points import slicePoints
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# columns in points files that are in m and should be converted to mm
+POINTSCALECOLS = ['x', 'y', 'z', 'vx', 'vy', 'vz', 'arc_length', 'magu']
+
+# speeds in points files are stored as float32, which is far finer than the mesh. 
+# positions and time stay float64 because slices are matched on them and they are written to the summaries
+POINTSDTYPE = np.float32
+POINTSPOSITIONCOLS = ['x', 'y', 'z', 'arc_length']
+
+# folder to hold binary caches of converted points files. the cache is off while this is empty
+POINTSCACHEROOT = ''
+
+# imported sliceSummaries tables by file name, with the mtime of the file when it was imported
+_summaryCache:Dict[str, Tuple[float, Union[pd.DataFrame, List[Any]], dict]] = {}
+
+#-------------------------------------------------------------
+
+def pointsCacheFN(file:str) -> Tuple[str, str]:
+    '''get the names of the binary cache of an imported points csv, and its header file. 
+    caches go in POINTSCACHEROOT, in a copy of the folder tree that holds the csv. returns '','' if the cache is off'''
+    if len(POINTSCACHEROOT)==0:
+        return '',''
+    folder = os.path.splitdrive(os.path.abspath(os.path.dirname(file)))[1].lstrip(os.sep)
+    cachefolder = os.path.join(POINTSCACHEROOT, folder)
+    bn = os.path.splitext(os.path.basename(file))[0]
+    return os.path.join(cachefolder, f'{bn}.npy'), os.path.join(cachefolder, f'{bn}.json')
+
+def importPointsCache(file:str) -> Tuple[Union[pd.DataFrame, List[Any]], Dict]:
+    '''import the binary cache of a points csv that was already converted by importPointsFile. returns [],{} if there is no up to date cache'''
+    npyfn, jsonfn = pointsCacheFN(file)
+    if len(npyfn)==0:
+        return [],{}
+    try:
+        if os.path.getmtime(npyfn)<os.path.getmtime(file) or os.path.getmtime(jsonfn)<os.path.getmtime(file):
+            return [],{}
+        with open(jsonfn, 'r') as f:
+            header = json.load(f)
+        arr = np.load(npyfn)
+    except (OSError, ValueError):
+        return [],{}
+    d = pd.DataFrame(arr[:,1:], columns=header['columns'], index=arr[:,0].astype(np.int64))
+    d = d.astype(header['dtypes'], copy=False)
+    return d, header['units']
+
+def exportPointsCache(file:str, d:pd.DataFrame, units:dict) -> None:
+    '''store points that were imported and converted by importPointsFile in a binary file, so the csv doesn't need to be parsed again.
+    only all-float tables are stored'''
+    if not all([dt==np.float64 or dt==POINTSDTYPE for dt in d.dtypes]):
+        return
+    npyfn, jsonfn = pointsCacheFN(file)
+    if len(npyfn)==0:
+        return
+    try:
+        os.makedirs(os.path.dirname(npyfn), exist_ok=True)
+        np.save(npyfn, np.column_stack((d.index.values, d.values)))
+        with open(jsonfn, 'w') as f:
+            json.dump({'columns':list(d.columns), 'units':units, 'dtypes':{s:str(dt) for s,dt in d.dtypes.items()}}, f)
+    except OSError as e:
+        logging.info(f'Could not cache points for {file}: {e}')
+
+
 
 
 #################################################################
@@ -49,25 +110,35 @@ class folderPoints:
     #--------------------------------------
     
     def importPointsFile(self, file:str) -> Tuple[Union[pd.DataFrame, List[Any]], Dict]:
-        '''This is useful for importing interfacePoints.csv files. '''
+        '''This is useful for importing interfacePoints.csv files. Converted points are cached in a binary file, which is used instead of the csv until the csv changes'''
+        d,units = importPointsCache(file)
+        if len(d)>0:
+            return d,units
         d,units = pi.plainIm(file, False)
         if len(d)==0:
             return d,units
-        try:
-            d = d[pd.to_numeric(d.time, errors='coerce').notnull()] # remove non-numeric times
-        except:
-            pass
+        if 'time' in d and d['time'].dtype==np.float64:
+            d = d.loc[d['time'].notna().to_numpy()]   # remove blank times
+        else:
+            # plainIm could not read the whole table as floats
+            try:
+                d = d.loc[pd.to_numeric(d['time'], errors='coerce').notna().to_numpy()] # remove non-numeric times
+            except:
+                pass
         mdict = {'m':'mm', 'm/s':'mm/s'}
-        for s in ['x', 'y', 'z', 'vx', 'vy', 'vz', 'arc_length', 'magu']:
-            if s in d:
+        cols = [s for s in POINTSCALECOLS if s in d]
+        for s in cols:
+            if not d[s].dtype==np.float64:
                 try:
                     d[s] = d[s].astype(float)
                 except:
                     raise Exception(f'Non-numeric values for {s} in {file}')
-                else:
-                    d[s]*=1000
-                units[s]=mdict.get(units[s], units[s]+'*10^3')
+            units[s]=mdict.get(units[s], units[s]+'*10^3')
+        d[cols] = d[cols]*1000     # convert m to mm in one pass
+        speedcols = [s for s in cols if not s in POINTSPOSITIONCOLS]
+        d[speedcols] = d[speedcols].astype(POINTSDTYPE)
         d = d.sort_values(by='x')
+        exportPointsCache(file, d, units)
         return d,units
     
     def getExistingPoints(self, name:str, time:float):
@@ -117,7 +188,7 @@ class folderPoints:
     def makeRelativeX(self, pts:pd.DataFrame) -> pd.DataFrame:
         '''make the x position relative to the nozzle center'''
         xc = self.geo.nozzle_center_x_coord
-        pts['x'] =  [i-xc for i in pts['x']]
+        pts['x'] = pts['x'].values - xc
         return pts
     
     def convertXunits(self, pts:pd.DataFrame, units:dict, xunits:str, xvar:str='x') -> Tuple[pd.DataFrame, dict]:
@@ -137,11 +208,16 @@ class folderPoints:
     def selectSlice(self, pts:pd.DataFrame, xbehind:float) -> pd.DataFrame:
         '''select just the points closest to the xbehind position'''
         xlist = pto.xpts(pts)
-        xreal = pto.closest(xlist, xbehind)
+        xreal = pto.closest(xlist, xbehind, isSorted=True)   # xpts is sorted
         
         if abs(xreal-xbehind)>0.2:
             return []
-        ptsx = pts[pts['x']==xreal]
+        if pts['x'].is_monotonic_increasing:
+            # points files are sorted by x, so the slice is one run of rows
+            start, end = pto.xRuns(pts, [xreal])
+            ptsx = pts.iloc[start[0]:end[0]]
+        else:
+            ptsx = pts.loc[pts['x'].values==xreal]
         return ptsx.copy()
 
     def importPtsSlice(self, time:float, xbehind:float, xunits:str='mm') -> slicePoints:
@@ -179,10 +255,11 @@ class folderPoints:
         xbehind is distance behind nozzle in xunits. 
         returns a slicePoints object, which holds points, representations as polygons, and functions to find centroids etc.
         Finds the closest position to the requested position and gives up if there is no x value within 0.2 xunits'''
-        pts,u = self.importSummary()
+        pts,u = self.cachedSummary()
         if len(pts)==0:
-            return pts,u
-        pts = pts[pts.time==time]
+            return pts.copy(),u.copy()
+        pts = pts.loc[pts['time'].values==time]   # this copies the rows, so the cached table is not changed
+        u = u.copy()
         if len(pts)==0:
             return pts,u
         
@@ -192,13 +269,21 @@ class folderPoints:
         ptsx = self.selectSlice(pts, xbehind)
         return ptsx, u
     
-    def importSummary(self) -> Tuple[pd.DataFrame, dict]:
-        '''get the summary file'''
+    def cachedSummary(self) -> Tuple[pd.DataFrame, dict]:
+        '''get the summary file, importing it only if it has changed since the last import. the table is shared, so don't modify it'''
         fn = os.path.join(self.folder, 'sliceSummaries.csv')
         if not os.path.exists(fn):
             return pd.DataFrame([]), {}
-        pts, u = pi.plainIm(fn)
-        return pts,u
+        mtime = os.path.getmtime(fn)
+        if not (fn in _summaryCache and _summaryCache[fn][0]==mtime):
+            pts, u = pi.plainIm(fn)
+            _summaryCache[fn] = (mtime, pts, u)
+        return _summaryCache[fn][1], _summaryCache[fn][2]
+    
+    def importSummary(self) -> Tuple[pd.DataFrame, dict]:
+        '''get the summary file'''
+        pts, u = self.cachedSummary()
+        return pts.copy(), u.copy()
         
     
     #--------------------------------------
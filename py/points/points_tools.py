@@ -34,9 +34,18 @@ def xpts(data:pd.DataFrame) -> pd.Series:
     xl = np.sort(data.x.unique())
     return xl
 
-def closest(lst:List[float], K:float) -> float: # RG
-    '''find the closest value in a list to the float K'''
+def xRuns(data:pd.DataFrame, xlist:List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    '''for a dataframe that is sorted by x, get the first row and one past the last row that have each x position in xlist, 
+    so data.iloc[start:end] is the slice at that x'''
+    xv = data['x'].values
+    return np.searchsorted(xv, xlist, side='left'), np.searchsorted(xv, xlist, side='right')
+
+def closest(lst:List[float], K:float, isSorted:bool=False) -> float: # RG
+    '''find the closest value in a list to the float K. isSorted=True if the list is sorted in increasing order, so we can do a binary search'''
     lst = np.asarray(lst)
+    if isSorted:
+        i = np.searchsorted(lst, K)
+        lst = lst[max(i-1,0):min(i+1,len(lst))]   # only the neighbors of K can be closest
     idx = (np.abs(lst - K)).argmin()
     return lst[idx]
 
@@ -96,27 +105,17 @@ def denoise(pts:np.ndarray) -> np.ndarray: # RG
     y = pts[:,1]
     x0 = np.mean(x)
     y0 = np.mean(y)
-    points = np.zeros((90,2))
     phi = np.degrees(sortPolar(setZ(np.column_stack((x,y)),0))[1])/4 # quarter-angle values for each point
-    miss = 0 # handles situations where there are no points in the slice
-    for theta in range(90): # slice for effectively every 4 degrees
-        eligx = []
-        eligy = []
-        r = []
-        for i,val in enumerate(phi):
-            if val>=theta and val<theta+1:
-                eligx.append(x[i]) # x of point in slice
-                eligy.append(y[i]) # y of point in slice
-                r.append(np.sqrt((x[i]-x0)**2+(y[i]-y0)**2)) # distance of point from center
-        if len(r)>0:
-            d = r.index(max(r))
-            outpt = [eligx[d],eligy[d]] # coordinates of point furthest away
-            points[theta-miss] = outpt # add point to points
-        else:
-            miss+=1
-    if miss==0:
-        return points
-    return points[:-miss]
+    keep = np.flatnonzero((phi>=0)&(phi<90)) # slice for effectively every 4 degrees
+    if len(keep)==0:
+        return np.zeros((0,2))  # handles situations where there are no points in any slice
+    bins = phi[keep].astype(np.int64)
+    r2 = (x[keep]-x0)**2+(y[keep]-y0)**2 # squared distance of point from center
+    order = np.lexsort((-r2, bins))   # by slice, then furthest point first
+    sb = bins[order]
+    first = np.concatenate(([True], sb[1:]!=sb[:-1]))
+    sel = keep[order[first]]  # coordinates of point furthest away in each slice
+    return np.column_stack((x[sel], y[sel]))
 
 def xspoints(p:pd.DataFrame, dist:float, ore:str) -> Union[np.ndarray, List[float]]: # RG
     '''take interface points and shift them the desired offset from the nozzle
@@ -67,7 +67,7 @@ class segmentPoints:
             m = df2.dtheta.max()
             if m>5:
                 # rearrange the points so they go from one endpoint to another endpoint
-                row = df2[df2.dtheta==m]
+                row = df2.loc[df2['dtheta'].values==m]
                 i = row.iloc[0].name
                 df2.loc[:i, 'theta'] = df2.loc[:i, 'theta']+360
                 df2.sort_values(by='theta', inplace=True, ignore_index=True)
@@ -288,11 +288,9 @@ class slicePoints:
         '''get the coordinates of a polygon centroid'''
         if hasattr(self, 'cx'):
             return self.cx, self.cy
-        p = self.polygon()
-        c = p.centroid.wkt
-        slist = re.split('\(|\)| ', c)
-        self.cx = float(slist[2])
-        self.cy = float(slist[3])
+        c = self.polygon().centroid
+        self.cx = c.x
+        self.cy = c.y
         return self.cx,self.cy
     
     def area(self) -> float:
@@ -12,13 +12,16 @@ from datetime import datetime
 import time
 import logging, platform, socket, sys
 import traceback
+import copy
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 import file.file_handling as fh
-from file.backwards_read import fileReadBackwards
+from file.backwards_read import fileTail, TAILCHUNK, rfindLine, lineAt
 from file.file_export import *
 from scrape_tools import *
 
@@ -32,6 +35,23 @@ for s in ['matplotlib']:
 
 #-------------------------------------------------------------------------------------------------  
 
+LOGHEAD = 1<<12 # bytes at the start of a log to read the header from
+
+# sections of OpenFOAM dictionaries, in the order they appear in the file
+# each section is (line the section starts with, line the section ends with, name of the list in the scrape object that holds its values)
+FVSECTIONS = (('\t\"alpha', '\t}', 'fvSailist')
+              , ('\t\"pcorr', '\t}', 'fvSpcorrlist')
+              , ('\tp_rgh', '\t}', 'fvSprghlist')
+              , ('\tp_rghFinal', '\t}', 'fvSprghfinallist')
+              , ('\tU', '\t}', 'fvSUlist')
+              , ('PIMPLE', '\t}', 'fvSPIMPLElist'))
+TPSECTIONS = (('ink', '}', 'TPinklist')
+              , ('sup', '}', 'TPsuplist'))
+DMDSECTIONS = (('dynamicRefineFvMeshCoeffs', '\tcorrectFluxes', 'DMDlist'),)
+CDSECTIONS = (('application', '//', 'controlDictList'),)
+
+# values scraped from OpenFOAM dictionaries, keyed by (file name, file size, file modification time)
+_dictCache:Dict[Tuple[str,int,int], Dict[str, Any]] = {}
 
 
 class scrape:
@@ -47,6 +67,22 @@ class scrape:
         self.casefold = self.fh.caseFolder()
         self.folder = ['folder', os.path.basename(folder)] # just the folder name
         self.compareto = ['compare_to', '', '']
+        
+        # OpenFOAM dictionaries to scrape
+        self.dictFiles = {'blockMeshDict':os.path.join(self.meshfold, 'system', 'blockMeshDict')
+                          , 'snappyHexMeshDict':os.path.join(self.meshfold, 'system', 'snappyHexMeshDict')
+                          , 'setFieldsDict':os.path.join(self.casefold, 'system', 'setFieldsDict')
+                          , 'controlDict':os.path.join(self.casefold, 'system', 'controlDict')
+                          , 'fvSolution':os.path.join(self.casefold, 'system', 'fvSolution')
+                          , 'dynamicMeshDict':os.path.join(self.casefold, 'constant', 'dynamicMeshDict')
+                          , 'transportProperties':os.path.join(self.casefold, 'constant', 'transportProperties')
+                          , 'U':os.path.join(self.casefold, '0', 'U')}
+        self.lines = {} # lines of files that have already been read, keyed by full path
+        self.present = self.presentFiles() # full paths of files that exist in the folders we scrape
+        
+        # log files, or empty strings if there are no logs
+        self.shmLog = self.firstPresent([os.path.join(self.meshfold, 'log_snappyHexMesh')])
+        self.ifLog = self.firstPresent([os.path.join(self.casefold, 'log_interFoam'), os.path.join(self.fold, 'log_interFoam')])
 
         self.initRates()
         self.initGeo()
@@ -235,7 +271,72 @@ class scrape:
         
     #-------------------------
     
+    def presentFiles(self) -> set:
+        '''list the files in all of the folders we scrape from, so the scrapers can check if a file exists without checking the file system for each file'''
+        present = set()
+        folders = [os.path.join(self.meshfold, 'system'), os.path.join(self.casefold, 'system')
+                   , os.path.join(self.casefold, 'constant'), os.path.join(self.casefold, '0')
+                   , self.fold, self.casefold, self.meshfold]
+        for folder in dict.fromkeys(folders):
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            present.add(entry.path)
+            except OSError:
+                # folder doesn't exist
+                pass
+        return present
+    
+    def firstPresent(self, fns:List[str]) -> str:
+        '''get the first file in the list that exists, or an empty string if none of them exist'''
+        for fn in fns:
+            if fn in self.present:
+                return fn
+        return ''
+    
+    def readDicts(self) -> None:
+        '''read all of the OpenFOAM dictionaries at once, so waiting on the file system for one file overlaps with the others'''
+        fns = [fn for fn in self.dictFiles.values() if not fn in self.lines and fn in self.present and not self.cacheKey(fn) in _dictCache]
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            for fn, lines in zip(fns, ex.map(readLines, fns)):
+                self.lines[fn] = lines
+                
+    def cacheKey(self, fn:str) -> Tuple[str,int,int]:
+        '''get the key for the file in _dictCache'''
+        st = os.stat(fn)
+        return (fn, st.st_size, st.st_mtime_ns)
+    
+    def fromCache(self, fn:str) -> bool:
+        '''if the file hasn't changed since the last time it was scraped, copy the scraped values into this object and return True'''
+        key = self.cacheKey(fn)
+        if not key in _dictCache:
+            return False
+        for attr, val in _dictCache[key].items():
+            setattr(self, attr, copy.deepcopy(val))
+        return True
+    
+    def toCache(self, fn:str, attrs:List[str]) -> None:
+        '''store the values scraped from the file, where attrs are the names of the attributes that the file was scraped into'''
+        _dictCache[self.cacheKey(fn)] = {attr:copy.deepcopy(getattr(self, attr)) for attr in attrs}
+        
+    def fileLines(self, fn:str) -> List[str]:
+        '''get the lines in a file, reading it if it hasn't been read yet'''
+        if not fn in self.lines:
+            self.lines[fn] = readLines(fn)
+        return self.lines[fn]
+    
+    def scrapeSections(self, lines:List[str], sections:Tuple[Tuple[str,str,str]], i:int=0) -> int:
+        '''scrape a list of sections from a file, where sections is one of the tuples of sections defined at the top of this file
+        lines is a list of lines from readLines
+        i is the index of the line to start at
+        returns the index of the line we just read'''
+        for startString, endString, name in sections:
+            i = listLevel(startString, endString, lines, i, getattr(self, name))
+        return i
+    
     def scrapeAll(self):
+        self.readDicts()
         self.scrapeGeo()
         self.scrapeBlockMeshDict()
         self.scrapeSetFieldsDict()
@@ -249,11 +350,10 @@ class scrape:
 
     def table(self) -> List[List[str]]:
         '''this function takes all the values we ripped and stored as variables in the scrape object and turns them into a table with 2 columns: the variable name and the variable value'''
-        col = [] # start with an empty table, then add to it sequentially
-        for i in [self.folder, self.version, self.compareto, self.shmtimes, \
+        # start with the run info, then add to the table sequentially
+        col = [self.folder, self.version, self.compareto, self.shmtimes, \
                   self.shmtimem, self.iftimes, self.iftimehr, \
-                  self.simTime, self.simrate]: # RG
-            col.append(i)
+                  self.simTime, self.simrate] # RG
         ca(col, ['', '', 'mesh','GEOMETRY'],\
            [self.GEOniw, self.GEOnt, self.GEObw, self.GEObd, \
             self.GEOnl, self.GEOblc, self.GEObrc, self.GEObfc,\
@@ -289,16 +389,24 @@ class scrape:
     def scrapeSHMLog(self) -> None:
         '''scrape the snappyHexMesh log file
         s is a scrape object'''
-        shmlog = os.path.join(self.meshfold, 'log_snappyHexMesh')
-        if os.path.exists(shmlog):
-            # it's useful to go backwards here because we're just looking for the time reported at the end of the file
-            for line in fileReadBackwards(shmlog):
-                if line.startswith('Finished meshing'):
-                    strs = re.split('Finished meshing in = | s', line)
+        shmlog = self.shmLog
+        if len(shmlog)>0:
+            # we're just looking for the time reported at the end of the file, so only read the end of the file
+            # if it isn't there, read a bigger piece of the end until we've read the whole file
+            size = os.path.getsize(shmlog)
+            chunk = TAILCHUNK
+            while True:
+                tail = fileTail(shmlog, chunk)
+                i = rfindLine(tail, b'Finished meshing')
+                if i>=0:
+                    strs = SHMFINISHED.split(lineAt(tail, i))
                     shmtime = float(strs[1])
                     self.shmtimes[1] = "%.2f" % shmtime
                     self.shmtimem[1] = "%.2f" % (shmtime/60)
                     return 
+                if chunk>=size:
+                    return
+                chunk = chunk*4
 
 
 
@@ -307,44 +415,52 @@ class scrape:
             Because interFoam can take hours to days, sometimes runs get split into pieces. 
             Each interFoam run adds onto the existing log file. 
             s is a scrape object  '''
-        ifLog = os.path.join(self.casefold, 'log_interFoam')
-        if not os.path.exists(ifLog):
-            ifLog = os.path.join(self.fold, 'log_interFoam')
-        if not os.path.exists(ifLog):
+        ifLog = self.ifLog
+        if len(ifLog)==0:
             return
         iftime = 0 # this variable adds up all the times for separate interFoam runs
-        waitfortop = False # this variable tells us what to look for, so we only collect the last reported time from each run
         simtime = 0
-        # it's useful to go backwards here because we're just looking for the time reported at the end of the run
         
-        # extract OpenFOAM version number
-        with open(ifLog) as f:
-            line = ''
-            lii = 0
-            while not 'Version' in line and lii<6:
-                line = f.readline()
+        # extract OpenFOAM version number from the header
+        with open(ifLog, 'rb') as f:
+            head = f.read(LOGHEAD)
+        for line in head.decode('utf-8', 'replace').replace('\r\n', '\n').splitlines(True):
             if 'Version' in line:
-                spl = re.split('Version:| ', line)
+                spl = VERSION.split(line)
                 vers = spl[-1]
                 try:
                     vers = int(vers)
                 except:
                     pass
                 self.version[1] = vers
+                break
         
         # extract simulation time
-        for line in fileReadBackwards(ifLog):
-            if simtime==0 and line.startswith('Time = '):
-                strs = re.split('Time = ', line)
-                simtime = float(strs[1])
-            if (waitfortop and line.startswith('fileModificationChecking')): 
-                # when we hit fileModificationChecking, it's the end of the run, so now we should look for the next reported time
-                waitfortop = False
-            if (not waitfortop and line.startswith('ExecutionTime')):
-                # read the last reported ExecutionTime
-                strs = re.split('ExecutionTime = | s', line)
-                iftime+=float(strs[1])
-                waitfortop = True # now that we've read the time, look for the next end of run
+        # every run adds to the total time, so we need every run in the file. 
+        # instead of reading every line, map the file and search it for the lines we need
+        # if the whole log fits in the header and there are no times in it, the run failed before the first time step, so there is nothing else to read
+        if len(head)==LOGHEAD or b'Time = ' in head:
+            with open(ifLog, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # the last reported time
+                i = -1
+                while simtime==0:
+                    i = rfindLine(mm, b'Time = ', i)
+                    if i<0:
+                        break
+                    strs = lineAt(mm, i).split('Time = ')
+                    simtime = float(strs[1])
+                    
+                # the last reported ExecutionTime in each run. fileModificationChecking is at the top of each run
+                j = -1
+                while True:
+                    i = rfindLine(mm, b'ExecutionTime', j)
+                    if i<0:
+                        break
+                    strs = EXECUTIONTIME.split(lineAt(mm, i))
+                    iftime+=float(strs[1])
+                    j = rfindLine(mm, b'fileModificationChecking', i)
+                    if j<0:
+                        break
         # store the time in the scrape object in seconds and hr
         self.iftimes[1] = "%.2f" % iftime 
         self.iftimehr[1] = "%.2f" % (iftime/60/60)
@@ -379,114 +495,101 @@ class scrape:
     def scrapeBlockMeshDict(self) -> None:
         '''scrape blockMeshDict
         s is a scrape object'''
-        bm = os.path.join(self.meshfold, 'system', 'blockMeshDict')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                while not line.startswith('vertices'):
-                    line = f.readline()
-                # now we have reached the list of vertices
-                # because we establish a basic mesh with blockmeshDict and refine with snappyHexMesh, this list only contains 8 vertices
-                for i in range(2):
-                    line = f.readline() # read coords from the first list of points
-                strs = re.split('\(|\)| ', line)
-                self.GEOblc[1] = strs[1] # bath left coord
-                self.GEObbackc[1] = strs[2] # bath back coord
-                self.GEObbotc[1] = strs[3] # bath bottom coord
-                for i in range(7):
-                    line = f.readline() # read coords from the last list of points
-                strs = re.split('\(|\)| ', line)
-                self.GEObrc[1] = strs[1] # bath right coord
-                self.GEObfc[1] = strs[2] # bath front coord
-                self.GEObtc[1] = strs[3] # bath top coord
-                self.GEObw[1] = str(float(self.GEObrc[1]) - float(self.GEOblc[1])) # bath width
-                self.GEObd[1] = str(float(self.GEObfc[1]) - float(self.GEObbackc[1])) # bath depth
-                while not line.startswith('blocks'):
-                    line = f.readline()    
-                # now we have reached the list of blocks
-                # again, there is only one block because we're using snappyHexMesh
-                for i in range(2):
-                    line = f.readline() # read coords from the first list of blocks
-                strs = re.split('\) \(|\) s', line)
-                self.blocksdims[1] = strs[1] # number of cells in the blocks: this should look like (# # #)
-                
-                return
+        bm = self.dictFiles['blockMeshDict']
+        if bm in self.present:
+            lines = self.fileLines(bm)
+            i = findLine(lines, 'vertices')
+            # now we have reached the list of vertices
+            # because we establish a basic mesh with blockmeshDict and refine with snappyHexMesh, this list only contains 8 vertices
+            i+=2 # read coords from the first list of points
+            strs = PARENSPACE.split(lines[i])
+            self.GEOblc[1] = strs[1] # bath left coord
+            self.GEObbackc[1] = strs[2] # bath back coord
+            self.GEObbotc[1] = strs[3] # bath bottom coord
+            i+=7 # read coords from the last list of points
+            strs = PARENSPACE.split(lines[i])
+            self.GEObrc[1] = strs[1] # bath right coord
+            self.GEObfc[1] = strs[2] # bath front coord
+            self.GEObtc[1] = strs[3] # bath top coord
+            self.GEObw[1] = str(float(self.GEObrc[1]) - float(self.GEOblc[1])) # bath width
+            self.GEObd[1] = str(float(self.GEObfc[1]) - float(self.GEObbackc[1])) # bath depth
+            i = findLine(lines, 'blocks', i)
+            # now we have reached the list of blocks
+            # again, there is only one block because we're using snappyHexMesh
+            i+=2 # read coords from the first list of blocks
+            strs = BLOCKDIMS.split(lines[i])
+            self.blocksdims[1] = strs[1] # number of cells in the blocks: this should look like (# # #)
+            
+            return
 
 
     def scrapeSetFieldsDict(self) -> None:
         '''scrape setFieldsDict
         s is a scrape object'''
-        bm = os.path.join(self.casefold, 'system', 'setFieldsDict')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                while not line.startswith('\t\tp1'):
-                    line = f.readline()
-                # now we have reached the bottom point of the nozzle
-                strs = re.split('\(|\)| ', line) # RG
-                while '' in strs:
-                    strs.remove('')
-                self.GEOncxc[1] = str(1000*float(strs[1])) # nozzle center x
-                self.GEOncyc[1] = str(1000*float(strs[2])) # nozzle center y
-                self.GEOnbc[1] = (1000*float(strs[3])) # nozzle bottom 
-                try:
-                    btc = float(self.GEObtc[1]) # bath top coord
-                except:
-                    self.GEOnl[1] = ""
-                else:
-                    self.GEOnl[1] = str(btc - self.GEOnbc[1]) # nozzle length
-                self.GEOnbc[1] = str(self.GEOnbc[1])
-                return
+        bm = self.dictFiles['setFieldsDict']
+        if bm in self.present:
+            lines = self.fileLines(bm)
+            i = findLine(lines, '\t\tp1')
+            # now we have reached the bottom point of the nozzle
+            strs = PARENSPACE.split(lines[i]) # RG
+            while '' in strs:
+                strs.remove('')
+            self.GEOncxc[1] = str(1000*float(strs[1])) # nozzle center x
+            self.GEOncyc[1] = str(1000*float(strs[2])) # nozzle center y
+            self.GEOnbc[1] = (1000*float(strs[3])) # nozzle bottom 
+            try:
+                btc = float(self.GEObtc[1]) # bath top coord
+            except:
+                self.GEOnl[1] = ""
+            else:
+                self.GEOnl[1] = str(btc - self.GEOnbc[1]) # nozzle length
+            self.GEOnbc[1] = str(self.GEOnbc[1])
+            return
 
 
     def scrapeU(self) -> None:
         '''scrape 0/U
         s is a scrape object'''
-        bm = os.path.join(self.casefold, '0', 'U')
+        bm = self.dictFiles['U']
         
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                # get geometry
-                if len(self.GEOnl[1])==0 or len(self.GEOna[1])==0:
-                    self.scrapeGeo()
-                horiz = self.GEOhoriz[1]
-                if type(horiz) is str:
-                    if 'true' in horiz.lower():
-                        horiz = True
-                    else:
-                        horiz = False
-                
-                # read bath speed
-                line = f.readline()
-                while not line.startswith('\tbathFlow'):
-                    line = f.readline()
-                # now we have reached the bath flow section
-                for i in range(3):
-                    line = f.readline()
-                if horiz:
-                    strs = re.split('\(|\)| |-', line)
-                    self.GEObathv[1] = strs[5] # bath velocity: this will be reported in m/s
+        if bm in self.present:
+            lines = self.fileLines(bm)
+            # get geometry
+            if len(self.GEOnl[1])==0 or len(self.GEOna[1])==0:
+                self.scrapeGeo()
+            horiz = self.GEOhoriz[1]
+            if type(horiz) is str:
+                if 'true' in horiz.lower():
+                    horiz = True
                 else:
-                    strs = re.split('\(|\)| ', line)
-                    self.GEObathv[1] = strs[2] # bath velocity: this will be reported in m/s
-                
-                # read ink speed
-                while not line.startswith('\tinkFlow'):
-                    line = f.readline()
-                # now we have reached the ink flow section
-                for i in range(3):
-                    line = f.readline()
-                strs = re.split('\(|\)| |-', line)
-                
-                theta = np.radians(float(self.GEOna[1]))
-                vt = strs[5]
-                if theta==0:
-                    self.GEOinkv[1] = vt
-                else:
-                    ri = float(self.GEOniw[1])/2
-                    l = float(self.GEOnl[1])
-                    self.GEOinkv[1] = float(vt)*(ri+l*np.tan(theta))**2/ri**2 # ink velocity: this will be reported in m/s
-                return
+                    horiz = False
+            
+            # read bath speed
+            i = findLine(lines, '\tbathFlow')
+            # now we have reached the bath flow section
+            i+=3
+            if horiz:
+                strs = PARENSPACEDASH.split(lines[i])
+                self.GEObathv[1] = strs[5] # bath velocity: this will be reported in m/s
+            else:
+                strs = PARENSPACE.split(lines[i])
+                self.GEObathv[1] = strs[2] # bath velocity: this will be reported in m/s
+            
+            # read ink speed
+            i = findLine(lines, '\tinkFlow', i)
+            # now we have reached the ink flow section
+            i+=3
+            strs = PARENSPACEDASH.split(lines[i])
+            
+            theta = np.radians(float(self.GEOna[1]))
+            vt = strs[5]
+            if theta==0:
+                self.GEOinkv[1] = vt
+            else:
+                ri = float(self.GEOniw[1])/2
+                l = float(self.GEOnl[1])
+                self.GEOinkv[1] = float(vt)*(ri+l*np.tan(theta))**2/ri**2 # ink velocity: this will be reported in m/s
+            return
         else:
             logging.info(f'path {bm} does not exist')
 
@@ -497,36 +600,35 @@ class scrape:
         to change which fields we collect, go back to the scrape class definition
         we're collecting data for SHMlist, CMClist, CMCfixedWallsLevel, SClist, ALClist, ALCfixedWallsLayers, MQClist, and SHMmergeTolerance
         s is a scrape object'''
-        bm = os.path.join(self.meshfold, 'system', 'snappyHexMeshDict')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                # first determine if castellatedMesh, snapping, and layers are active
-                line = listLevel('castellatedMesh', 'geometry', line, f, self.SHMlist)
-                # then read in castellated mesh controls
-                if self.SHMlist[0][1]=='true':
-                    # only collect castellatedMesh variables if we're using a castellated mesh
-                    line = listLevel('castellatedMeshControls', '\tfeatures', line, f, self.CMClist)
-                    while not line.startswith('\t\t\tfile\t\"fixed'):
-                        line = f.readline()
-                    line = f.readline()
-                    strs = re.split(';|\t', line)
-                    self.CMCfixedWallsLevel[1] = strs[4]
-                if self.SHMlist[1][1]=='true':
-                    # only collect snap variables if we're using snapping
-                    line = listLevel('snapControls', 'addLayersControls', line, f, self.SClist)
-                if self.SHMlist[2][1]=='true':
-                    # only collect layers variables if we're using layers
-                    listLevel('addLayersControls', '\tlayers', line, f, self.ALClist)
-                    while not line.startswith('\t\tfixed'):
-                        line = f.readline()
-                    for i in range(2):
-                        line = f.readline()
-                    strs = re.split(';|\t', line)
-                    self.ALCfixedWallsLayers[1] = strs[4]
-                line = listLevel('meshQualityControls', 'writeFlags', line, f, self.MQClist)
-                line = readLevel0('mergeTolerance', line, f, self.SHMmergeTolerance)
+        bm = self.dictFiles['snappyHexMeshDict']
+        if bm in self.present:
+            if self.fromCache(bm):
                 return
+            lines = self.fileLines(bm)
+            # first determine if castellatedMesh, snapping, and layers are active
+            i = listLevel('castellatedMesh', 'geometry', lines, 0, self.SHMlist)
+            # then read in castellated mesh controls
+            if self.SHMlist[0][1]=='true':
+                # only collect castellatedMesh variables if we're using a castellated mesh
+                i = listLevel('castellatedMeshControls', '\tfeatures', lines, i, self.CMClist)
+                i = findLine(lines, '\t\t\tfile\t\"fixed', i)
+                i+=1
+                strs = SEMITAB.split(lines[i])
+                self.CMCfixedWallsLevel[1] = strs[4]
+            if self.SHMlist[1][1]=='true':
+                # only collect snap variables if we're using snapping
+                i = listLevel('snapControls', 'addLayersControls', lines, i, self.SClist)
+            if self.SHMlist[2][1]=='true':
+                # only collect layers variables if we're using layers
+                i = listLevel('addLayersControls', '\tlayers', lines, i, self.ALClist)
+                i = findLine(lines, '\t\tfixed', i)
+                i+=2
+                strs = SEMITAB.split(lines[i])
+                self.ALCfixedWallsLayers[1] = strs[4]
+            i = listLevel('meshQualityControls', 'writeFlags', lines, i, self.MQClist)
+            i = readLevel0('mergeTolerance', lines, i, self.SHMmergeTolerance)
+            self.toCache(bm, ['SHMlist', 'CMClist', 'CMCfixedWallsLevel', 'SClist', 'ALClist', 'ALCfixedWallsLayers', 'MQClist', 'SHMmergeTolerance'])
+            return
         else:
             logging.warning(f'path {bm} does not exist')
 
@@ -534,13 +636,15 @@ class scrape:
     def scrapeDMD(self) -> None:
         '''scrape dynamicMeshDict
         s is a scrape object'''
-        bm = os.path.join(self.casefold, 'constant', 'dynamicMeshDict')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                # just collect the variables in the dynamicRefineFvMeshCoeffs section
-                line = listLevel('dynamicRefineFvMeshCoeffs', '\tcorrectFluxes', line, f, self.DMDlist)
+        bm = self.dictFiles['dynamicMeshDict']
+        if bm in self.present:
+            if self.fromCache(bm):
                 return
+            lines = self.fileLines(bm)
+            # just collect the variables in the dynamicRefineFvMeshCoeffs section
+            i = self.scrapeSections(lines, DMDSECTIONS)
+            self.toCache(bm, [sec[2] for sec in DMDSECTIONS])
+            return
         else:
             logging.warning(f'path {bm} does not exist')
 
@@ -548,21 +652,22 @@ class scrape:
     def scrapeTP(self) -> None:
         '''scrape transportProperties
         s is a scrape object'''
-        bm = os.path.join(self.casefold, 'constant', 'transportProperties')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                line = listLevel('ink', '}', line, f, self.TPinklist)
-                line = listLevel('sup', '}', line, f, self.TPsuplist)
-                line = readLevel0('sigma', line, f, self.TPsigma)
+        bm = self.dictFiles['transportProperties']
+        if bm in self.present:
+            if self.fromCache(bm):
                 return
+            lines = self.fileLines(bm)
+            i = self.scrapeSections(lines, TPSECTIONS)
+            i = readLevel0('sigma', lines, i, self.TPsigma)
+            self.toCache(bm, [sec[2] for sec in TPSECTIONS]+['TPsigma'])
+            return
         else:
             logging.warning(f'path {bm} does not exist')
 
     def scrapeLabels(self) -> None:
         '''scrape the labels.csv document'''
         bm = os.path.join(self.fold, 'labels.csv')
-        if os.path.exists(bm):
+        if bm in self.present:
             with open(bm, "r") as f:
                 data = list(csv.reader(f))
                 self.TPinklist[0][1]=data[0][1]
@@ -572,12 +677,14 @@ class scrape:
     def scrapeCD(self) -> None:
         '''scrape controlDict
         s is a scrape object'''
-        bm = os.path.join(self.casefold, 'system', 'controlDict')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                line = listLevel('application', '//', line, f, self.controlDictList)
+        bm = self.dictFiles['controlDict']
+        if bm in self.present:
+            if self.fromCache(bm):
                 return
+            lines = self.fileLines(bm)
+            i = self.scrapeSections(lines, CDSECTIONS)
+            self.toCache(bm, [sec[2] for sec in CDSECTIONS])
+            return
         else:
             logging.warning(f'path {bm} does not exist')
 
@@ -588,17 +695,14 @@ class scrape:
             fvSolution files are broken into sections by the variable we're solving for, e.g. alpha, pcorr, p_rgh. 
             scrape each section into a different list stored in s
             s is a scrape object'''
-        bm = os.path.join(self.casefold, 'system', 'fvSolution')
-        if os.path.exists(bm):
-            with open (bm, "r") as f:
-                line = f.readline()
-                line = listLevel('\t\"alpha', '\t}', line, f, self.fvSailist)
-                line = listLevel('\t\"pcorr', '\t}', line, f, self.fvSpcorrlist)
-                line = listLevel('\tp_rgh', '\t}', line, f, self.fvSprghlist)
-                line = listLevel('\tp_rghFinal', '\t}', line, f, self.fvSprghfinallist)
-                line = listLevel('\tU', '\t}', line, f, self.fvSUlist)
-                line = listLevel('PIMPLE', '\t}', line, f, self.fvSPIMPLElist)
+        bm = self.dictFiles['fvSolution']
+        if bm in self.present:
+            if self.fromCache(bm):
                 return
+            lines = self.fileLines(bm)
+            i = self.scrapeSections(lines, FVSECTIONS)
+            self.toCache(bm, [sec[2] for sec in FVSECTIONS])
+            return
         else:
             logging.warning(f'path {bm} does not exist')
 
@@ -614,21 +718,26 @@ class scrape:
                     , 'nozzle bottom coord':'nbc', 'nozzle center x coord':'ncxc', 'nozzle center y coord':'ncyc', 'nozzle angle':'na'
                     , 'horizontal':'horiz', 'adjacent filament orientation':'adj', 'adjacent filament offset':'dst'
                     , 'corresponding simulation':'cor', 'bath velocity':'bathv', 'ink velocity':'inkv'} # RG
-        if os.path.exists(bm):
+        if bm in self.present:
             with open(bm, "r") as f:
-                data = list(csv.reader(f))
-                for row in data:
-                    # name of variable, remove units if there
-                    s1 = re.split(' \(', row[0])[0]
-                    # remove space from beginning of units
-                    if row[2][0]==' ':
-                        row[2]=row[2][1:]
-                    # store variable
-                    if s1 in transfer:
-                        setattr(self, f'GEO{transfer[s1]}', row)
-                    if s1 == 'corresponding simulation':
-                        self.compareto[1] = row[1][1:] # RG
-                return
+                text = f.read()
+            if '"' in text:
+                # quoted values can contain commas, so let the csv module split the rows
+                data = list(csv.reader(text.splitlines()))
+            else:
+                data = [line.split(',') for line in text.splitlines()]
+            for row in data:
+                # name of variable, remove units if there
+                s1 = row[0].split(' (')[0]
+                # remove space from beginning of units
+                if row[2][0]==' ':
+                    row[2]=row[2][1:]
+                # store variable
+                if s1 in transfer:
+                    setattr(self, f'GEO{transfer[s1]}', row)
+                if s1 == 'corresponding simulation':
+                    self.compareto[1] = row[1][1:] # RG
+            return
         else:
             return
         
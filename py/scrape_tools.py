@@ -21,6 +21,18 @@ for s in ['matplotlib']:
 
 
 
+# compiled patterns for splitting lines in OpenFOAM files and logs
+SEMITAB = re.compile(';|\t')                # name\tvalue; lines in dictionaries
+PARENSPACE = re.compile(r'\(|\)| ')         # coordinates, e.g. (0 0 0)
+PARENSPACEDASH = re.compile(r'\(|\)| |-')  # coordinates with negative signs stripped
+BLOCKDIMS = re.compile(r'\) \(|\) s')      # number of cells in a block
+SHMFINISHED = re.compile('Finished meshing in = | s')
+EXECUTIONTIME = re.compile('ExecutionTime = | s')
+VERSION = re.compile('Version:| ')
+# name and value in each line of a section, the same as splitting each line at ; and tabs 
+# and taking the first non-empty string and the string after it
+NAMEVALUE = re.compile('^[;\t]*([^;\t\n]+)[;\t]([^;\t\n]*\n?)', re.M)
+
 #-------------------------------------------------------------------------------------------------  
 
 def ca(col:List[List[str]], hlist:List[str], li:List[List[str]]) -> None:
@@ -28,28 +40,34 @@ def ca(col:List[List[str]], hlist:List[str], li:List[List[str]]) -> None:
         col is a table with 2 columns. 
         hlist is a list of headers that describe this chunk of data. they are added as rows with an empty value 
         li is a list of [variable name, value] to add to col'''
-        for i in hlist:
-            col.append([i, ''])
-        for i in li:
-            col.append(i)
+        col.extend([[i, ''] for i in hlist])
+        col.extend(li)
+
+def listIndex(l:List[List[str]]) -> Dict[str,int]:
+    '''listIndex finds the row of each variable name in a list with 2 columns, so values can be placed without searching the list
+        if a name appears more than once, the first row is kept
+        l is a list'''
+    index = {}
+    for i,row in enumerate(l):
+        if len(row)>0 and not row[0] in index:
+            index[row[0]] = i
+    return index
 
-def placeInList(l:List[List[str]], s:str, v:str) -> None: 
+def placeInList(l:List[List[str]], s:str, v:str, index:Dict[str,int]=None) -> None: 
     '''placeInList puts a value v into a list with 2 columns, where s is the name of the variable
-        this function will only place the value into the list if the variable name s is in the list and there isn't already a value there
+        this function will only place the value into the list if the variable name s is in the list
         l is a list
         s is a string
-        v is a value'''
+        v is a value
+        index is the dictionary of rows from listIndex(l). if it is not given, it is built from l'''
+    if index is None:
+        index = listIndex(l)
     
     # find the index in the list where this value should go
-    i = -1
-    found=False
-    while i<len(l)-1 and not found:
-        i+=1
-        if len(l[i])>0 and l[i][0]==s:
-            found=True    
+    i = index.get(s, -1)
             
     # put the value in the list
-    if not found:
+    if i<0:
         return
     else:
         l[i][1] = v # this puts the value in the list
@@ -59,46 +77,56 @@ def placeInList(l:List[List[str]], s:str, v:str) -> None:
 def cancelUnits(s:str) -> str:
     '''cancelUnits removes the units list (e.g. [ 0 2 -1 0 0 0 0]) from a value
     s is a string'''
-    strs = re.split(' ', s)
-    return strs[-1]
+    return s.rpartition(' ')[2]
+
+
+def readLines(fn:str) -> List[str]:
+    '''readLines reads all of the lines in a file at once, so the scrapers can step through them by index instead of reading one line at a time
+    fn is a full path name
+    returns a list of lines, including their line endings'''
+    with open(fn, 'rb') as f:
+        data = f.read()
+    # decode the whole file at once instead of going through the text reader's incremental decoder
+    return data.decode('utf-8', 'replace').replace('\r\n', '\n').splitlines(True)
 
 
-def listLevel(startString:str, endString:str, line:str, f:TextIO, l:List[List[str]]) -> str:
+def findLine(lines:List[str], s:str, i:int=0) -> int:
+    '''findLine finds the first line at or after index i that starts with s
+    lines is a list of lines from readLines
+    returns the index of the line'''
+    while not lines[i].startswith(s):
+        i+=1
+    return i
+
+
+def listLevel(startString:str, endString:str, lines:List[str], i:int, l:List[List[str]]) -> int:
     '''listLevel is a tool that looks for sections of interest within files and scrapes values out of them
     startString is a string that tells us that we've reached the section of interest. It should be at the beginning of the line
     endString tells us that we've reached the end of the section of interest. It should be at the beginning of the line.
-    line is the starting line
-    f is a file stream created by open()
+    lines is a list of lines from readLines
+    i is the index of the starting line
     l is a list of variable names and values that we're going to scrape values into
-    returns the line we just read'''
+    returns the index of the line we just read'''
     
-    while not line.startswith(startString):
-        line = f.readline()
+    i = findLine(lines, startString, i)
+    j = findLine(lines, endString, i)
     
-    while not line.startswith(endString):
-        strs = re.split(';|\t', line) # split the line at tabs and semicolons
-        ii = 0
-        si = 0
-        while ii<len(strs) and len(strs[ii])==0:
-            ii+=1 # find the first non-empty string in the list
-        if ii+1<=len(strs)-1:
-            s0 = strs[ii] # if there are enough entries in the split line to contain a name and value, place this entry into l
-            s1 = cancelUnits(strs[ii+1])
-            placeInList(l, s0, s1)
-        line = f.readline()
-    return line  
-
-
-def readLevel0(s:str, line:str, f:TextIO, obj:List[List[str]]) -> str:
+    # match all of the names and values in the section at once
+    index = listIndex(l)   # look up rows by name instead of searching the list for every line
+    for m in NAMEVALUE.finditer(''.join(lines[i:j])):
+        placeInList(l, m.group(1), cancelUnits(m.group(2)), index)
+    return j  
+
+
+def readLevel0(s:str, lines:List[str], i:int, obj:List[List[str]]) -> int:
     '''readLevel0 is a simpler version of listLevel, where instead of placing many values in a list,
     we're looking for a single value. This function targets lines in files that have no tabs at the beginning, just "name\tvalue"
     s is a trigger string that tells us we've found the value we're looking for
-    line is a starting line
-    f is a file stream created by open()
+    lines is a list of lines from readLines
+    i is the index of the starting line
     obj is a [1x2] list into which we'll store our value
-    returns the line we just read'''
-    while not line.startswith(s):
-        line = f.readline()
-    strs = re.split(';|\t', line) # split the line at ; and tabs
+    returns the index of the line we just read'''
+    i = findLine(lines, s, i)
+    strs = SEMITAB.split(lines[i]) # split the line at ; and tabs
     obj[1] = strs[1] # the value will always be the second item
-    return line
\ No newline at end of file
+    return i
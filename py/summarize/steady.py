@@ -24,6 +24,15 @@ logger.setLevel(logging.DEBUG)
 
 #-------------------------------------------
 
+def windowRanges(vals:np.ndarray, col:np.ndarray, centers:np.ndarray, d:float) -> np.ndarray:
+    '''for each value in centers, get max-min of col over the points where vals is within d/2 of the center. 
+    vals must be sorted, and every center must be in vals. NaN values in col are ignored'''
+    lo = np.searchsorted(vals, centers-d/2, side='left')
+    hi = np.searchsorted(vals, centers+d/2, side='right')
+    bounds = np.ravel(np.column_stack((lo, hi)))
+    col = np.append(col, np.nan)  # so that windows can end at the last point
+    return np.fmax.reduceat(col, bounds)[::2] - np.fmin.reduceat(col, bounds)[::2]
+
 class steadyMetrics:
     '''for determining the point at which metrics remain steady.
     steadyList determines a list of times and positions which have reached steady state, for either steady in time or steady in position.
@@ -61,24 +70,19 @@ class steadyMetrics:
         '''for a single slice in time or position, find the point where it has flattened out'''
         l1 = l1.sort_values(by=self.other) # sort the slice by time if mode is x, x if mode is time
         list2 = l1[self.other].unique()
-        vdrange = 100
-        i = -1
-        while vdrange>self.vdcrit and i+1<len(list2):
-            i+=1
-            xtother = list2[i]
-            l2 = l1[(l1[self.other]>=xtother-self.dother/2) & (l1[self.other]<=xtother+self.dother/2)] 
-                # get a chunk of size dt centered around this time
-            vdrange = l2[self.col].max()-l2[self.col].min()
-        if i+1<len(list2):
-            other0 = xtother
-            while vdrange<=self.vdcrit and i+1<len(list2):
-                i+=1
-                xtother = list2[i]
-                l2 = l1[(l1[self.other]>=xtother-self.dother/2) & (l1[self.other]<=xtother+self.dother/2)] 
-                    # get a chunk of size dt centered around this time
-                vdrange = l2[self.col].max()-l2[self.col].min()
-            if i+1<len(list2):
-                otherf = xtother
+        if len(list2)==0:
+            return
+        vdrange = windowRanges(l1[self.other].values.astype(np.float64), l1[self.col].values.astype(np.float64), list2, self.dother)
+            # range of values in a chunk of size dt centered around each time
+        n = len(list2)
+        flat = np.flatnonzero(~(vdrange>self.vdcrit))   # first point where the chunk is steady
+        i = flat[0] if len(flat)>0 else n-1
+        if i+1<n:
+            other0 = list2[i]
+            notflat = np.flatnonzero(~(vdrange[i:]<=self.vdcrit))  # first point from there where the chunk is no longer steady
+            i = i+notflat[0] if len(notflat)>0 else n-1
+            if i+1<n:
+                otherf = list2[i]
             else:
                 otherf = 1000
             if self.mode=='xbehind':
@@ -120,7 +124,7 @@ class steadyMetrics:
 
         slicevals = ss[self.mode].unique() # this gets the list of unique values for the mode variable
         for sliceval in slicevals:
-            self.findSliceVal(ss[ss[self.mode]==sliceval], sliceval)
+            self.findSliceVal(ss.loc[ss[self.mode].values==sliceval], sliceval)
         self.df = pd.DataFrame(self.flatlist)
     
     def export(self) -> None:
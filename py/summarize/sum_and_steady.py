@@ -31,8 +31,8 @@ logger.setLevel(logging.DEBUG)
 class sumAndSteadySingle:
     '''for a single line, summarize and get steady metrics'''
     
-    def __init__(self, folder:str, overwrite:bool=False):
-        self.sa = summarizerSingle(folder, overwrite=overwrite)
+    def __init__(self, folder:str, overwrite:bool=False, processes:int=1):
+        self.sa = summarizerSingle(folder, overwrite=overwrite, processes=processes)
         if self.sa.success:
             for s in ['time', 'xbehind']:
                 steadyMetrics(folder, overwrite=overwrite, mode=s, dother=1, vdcrit=0.01, col='vertdispn')
@@ -40,9 +40,9 @@ class sumAndSteadySingle:
 class sumAndSteadyAdjacent:
     '''for 2 adjacent lines, summarize and get steady metrics'''
     
-    def __init__(self, folder:str, overwrite:bool=False):
+    def __init__(self, folder:str, overwrite:bool=False, processes:int=1):
         print(folder)
-        self.sa = summarizerAdjacent(folder, overwrite=overwrite)
+        self.sa = summarizerAdjacent(folder, overwrite=overwrite, processes=processes)
         if self.sa.success:
             for s in ['time', 'xbehind']:
                 steadyMetrics(folder, overwrite=overwrite, mode=s, dother=1, vdcrit=0.01, col='vertdispn')
@@ -11,12 +11,14 @@ import re
 from typing import List, Dict, Tuple, Union, Any
 import logging
 import traceback
+import multiprocessing
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 from points.folder_points import folderPoints
+import points.points_tools as pto
 from folder_stats import folderStats
 from file.file_handling import folderHandler
 from plainIm import *
@@ -26,20 +28,26 @@ from plainIm import *
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-
 #------------------------------------------------------
 
+def fileSummariesTask(task:Tuple[Any, str]) -> Tuple[List[dict], dict]:
+    '''summarize one interface points file. task is (summarizer object, file name), as described in summarizer.fileSummaries'''
+    s, f = task
+    return s.fileSummaries(f)
+
 class summarizer:
     '''given a simulation, get critical statistics on the filament shape
     folder is the full path name to the folder holding all the files for the simulation
         there must be an interfacePoints folder holding csvs of the interface points
     overwrite true to overwrite existing files, false to only write new files
+    processes is the number of processes to use to summarize the interface points files, which are independent of each other
     a return value of 0 indicates success
     a return value of 1 indicates failure'''
     
-    def __init__(self, folder:str, overwrite:bool=False):
+    def __init__(self, folder:str, overwrite:bool=False, processes:int=1):
         self.folder = folder
         self.success = False
+        self.processes = processes
         if not os.path.exists(folder):
             return
         self.fn = self.ssFile()
@@ -73,18 +81,53 @@ class summarizer:
         '''slice Summaries file name'''
         return os.path.join(self.folder, 'sliceSummaries.csv')
 
-    def addFile(self, f:str) -> None:
-        '''summarize the file and add it to the stack'''
+    def fileSummaries(self, f:str) -> Tuple[List[dict], dict]:
+        '''summarize each x slice in the file. returns a list of slice summaries and the units of the file'''
         print(f)
-        data, self.units = self.fp.importPointsFile(os.path.join(self.ipfolder, f))
+        data, units = self.fp.importPointsFile(os.path.join(self.ipfolder, f))
+        out = []
         if len(data)==0:
-            return
+            return out, units
         xlist = self.xlist(data)
-        for x in xlist:
-            sli = data[data['x']==x]
-            if len(sli)>9:
-                ss1 = self.sliceSummary(sli)
-                self.s.append(ss1)
+        if not data['x'].is_monotonic_increasing:
+            data = data.sort_values(by='x')
+        starts, ends = pto.xRuns(data, xlist)   # each slice is a run of rows, so there is no need to scan the table per x
+        keep = (ends-starts)>9
+        starts = starts[keep]
+        ends = ends[keep]
+        aggs = self.runAggregates(data, starts, ends)  # min, max, mean for all slices at once
+        for start, end, agg in zip(starts, ends, aggs):
+            out.append(self.sliceSummary(data.iloc[start:end], agg))
+        return out, units
+    
+    def sliceAggregates(self, sli:pd.DataFrame) -> Dict[str, float]:
+        '''get the min, max, and mean values that sliceSummary needs for a single slice'''
+        return {'ymin':sli['y'].min(), 'ymax':sli['y'].max(), 'zmin':sli['z'].min(), 'zmax':sli['z'].max()
+                , 'vxmean':sli['vx'].mean(), 'time':sli.iloc[0]['time']}
+    
+    def runAggregates(self, data:pd.DataFrame, starts:np.ndarray, ends:np.ndarray) -> List[Dict[str, float]]:
+        '''get the values in sliceAggregates for each slice data.iloc[start:end] at once. NaN values are ignored, as in pandas'''
+        if len(starts)==0:
+            return []
+        bounds = np.ravel(np.column_stack((starts, ends)))
+        if bounds[-1]==len(data):
+            bounds = bounds[:-1]   # reduceat runs the last start to the end of the table
+        def reduce(func, arr:np.ndarray) -> np.ndarray:
+            return func.reduceat(arr, bounds)[::2]
+        vx = data['vx'].values.astype(np.float64)
+        valid = ~np.isnan(vx)
+        ymin = reduce(np.fmin, data['y'].values)
+        ymax = reduce(np.fmax, data['y'].values)
+        zmin = reduce(np.fmin, data['z'].values)
+        zmax = reduce(np.fmax, data['z'].values)
+        vxmean = reduce(np.add, np.where(valid, vx, 0))/reduce(np.add, valid.astype(np.float64))
+        time = data['time'].values[starts]
+        return [{'ymin':ymin[i], 'ymax':ymax[i], 'zmin':zmin[i], 'zmax':zmax[i], 'vxmean':vxmean[i], 'time':time[i]} for i in range(len(starts))]
+
+    def addFile(self, f:str) -> None:
+        '''summarize the file and add it to the stack'''
+        out, self.units = self.fileSummaries(f)
+        self.s.extend(out)
                     
     def getTable(self) -> pd.DataFrame:
         '''go through all the interface points files and summarize each x and time slice
@@ -102,10 +145,19 @@ class summarizer:
             return
         self.s = []
         
-        for f in ipfiles:
-            self.addFile(f)
+        if self.processes>1 and len(ipfiles)>1:
+            chunksize = max(1, len(ipfiles)//(4*self.processes))
+            with multiprocessing.Pool(self.processes) as pool:
+                results = pool.map(fileSummariesTask, [(self, f) for f in ipfiles], chunksize=chunksize)
+            for out, self.units in results:
+                self.s.extend(out)
+        else:
+            for f in ipfiles:
+                self.addFile(f)
             
-        self.df = pd.DataFrame(self.s, dtype=np.float64)
+        header = self.defaultHeader()   # every slice summary has exactly these keys
+        arr = np.array([[row[k] for k in header] for row in self.s], dtype=np.float64).reshape(-1, len(header))
+        self.df = pd.DataFrame(arr, columns=header)
         self.df.dropna(inplace=True)
         
     def saveSummary(self):
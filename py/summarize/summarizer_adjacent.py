@@ -31,8 +31,8 @@ logger.setLevel(logging.DEBUG)
 class summarizerAdjacent(summarizer):
     '''for adjacent lines for a single simulation'''
     
-    def __init__(self, folder:str, overwrite:bool=False):
-        super().__init__(folder, overwrite)
+    def __init__(self, folder:str, overwrite:bool=False, processes:int=1):
+        super().__init__(folder, overwrite, processes=processes)
         
     def defaultHeader(self) -> list:
         return list(self.sliceUnits().keys())
@@ -56,9 +56,10 @@ class summarizerAdjacent(summarizer):
     
         
         
-    def sliceSummary(self, sli:pd.DataFrame) -> Dict[str, float]:
+    def sliceSummary(self, sli:pd.DataFrame, agg:dict=None) -> Dict[str, float]:
         '''sliceSummary collects important stats from a slice of a filament at a certain x and time and returns as a dictionary
         sli is a subset of points as a pandas dataframe
+        agg is the dictionary from sliceAggregates for this slice, if it has already been calculated
         fs is a folderStats object'''
         ev = -100 # error value
         rv = dict([[x, ev] for x in self.defaultHeader()])
@@ -70,7 +71,9 @@ class summarizerAdjacent(summarizer):
             # speeddecay is normalized by the bath speed
         rv['x'] = sli.iloc[0]['x']
         rv['xbehind'] = rv['x']-self.fs.geo.ncx
-        rv['time'] = np.float64(sli.iloc[0]['time'])
+        if agg is None:
+            agg = self.sliceAggregates(sli)
+        rv['time'] = np.float64(agg['time'])
 
         if len(sli)<10:
             #logging.error('Not enough points')
@@ -80,8 +83,8 @@ class summarizerAdjacent(summarizer):
         rv['centery'], rv['centerz'], rv['area'] = sm.centroidAndArea()
         rv['centeryr'] = rv['centery'] - self.fs.geo.intentycenter
         rv['centerzr'] = rv['centerz'] - self.fs.geo.intentzcenter
-        rv['maxheight'] = sli['z'].max()-sli['z'].min()
-        rv['maxwidth'] = sli['y'].max()-sli['y'].min()
+        rv['maxheight'] = agg['zmax']-agg['zmin']
+        rv['maxwidth'] = agg['ymax']-agg['ymin']
         if rv['maxheight']==0 or rv['maxwidth']==0:
             #logging.error('Cross-section is too small')
             raise ValueError('Cross-section is too small')
@@ -92,17 +95,17 @@ class summarizerAdjacent(summarizer):
         rv['maxheightn'] = rv['maxheight']/self.fs.geo.intenth # normalize height by nozzle diameter
         rv['maxwidthn'] = rv['maxwidth']/self.fs.geo.intentw # normalized width by intended width
 
-        rv['vertdisp'] = (sli['z'].min() - self.fs.geo.intentzbot)
+        rv['vertdisp'] = (agg['zmin'] - self.fs.geo.intentzbot)
         rv['vertdispn'] = rv['vertdisp']/self.fs.geo.niw
-        rv['horizdisp'] = (sli['y'].min() - self.fs.geo.intentyleft)
+        rv['horizdisp'] = (agg['ymin'] - self.fs.geo.intentyleft)
         rv['horizdispn'] = rv['horizdisp']/self.fs.geo.niw
         rv['aspectratio'] = rv['maxheight']/rv['maxwidth']
         rv['aspectration'] = rv['aspectratio']/(self.fs.geo.intenth/self.fs.geo.intentw)
-        rv['speed'] = sli['vx'].mean() # speed of interface points in x
+        rv['speed'] = agg['vxmean'] # speed of interface points in x
         rv['speeddecay'] = rv['speed']/self.fs.sup.dynamic['v'] # relative speed of interface relative to the bath speed
         rv['roughness'] = sm.roughness()
         rv['emptiness'] = sm.emptiness()
-        rv['asymmetryh'] = 0.5-(rv['centery']-sli.y.min())/rv['maxwidth']
-        rv['asymmetryv'] = 0.5-(rv['centerz']-sli.z.min())/rv['maxheight']
+        rv['asymmetryh'] = 0.5-(rv['centery']-agg['ymin'])/rv['maxwidth']
+        rv['asymmetryv'] = 0.5-(rv['centerz']-agg['zmin'])/rv['maxheight']
 
         return rv
\ No newline at end of file
@@ -30,8 +30,8 @@ logger.setLevel(logging.DEBUG)
 class summarizerSingle(summarizer):
     '''for single lines'''
     
-    def __init__(self, folder:str, overwrite:bool=False):
-        super().__init__(folder, overwrite)
+    def __init__(self, folder:str, overwrite:bool=False, processes:int=1):
+        super().__init__(folder, overwrite, processes=processes)
         
     def defaultHeader(self) -> list:
         return ['x', 'xbehind', 'time', 'centery', 'centerz', 'area', 'maxheight', 'maxwidth', 'centeryn', 'centerzn', 'arean', 'maxheightn', 'maxwidthn','vertdisp', 'vertdispn', 'aspectratio', 'speed', 'speeddecay']
@@ -51,9 +51,10 @@ class summarizerSingle(summarizer):
         return xlist
         
         
-    def sliceSummary(self, sli:pd.DataFrame) -> Dict[str, float]:
+    def sliceSummary(self, sli:pd.DataFrame, agg:dict=None) -> Dict[str, float]:
         '''sliceSummary collects important stats from a slice of a filament at a certain x and time and returns as a dictionary
         sli is a subset of points as a pandas dataframe
+        agg is the dictionary from sliceAggregates for this slice, if it has already been calculated
        '''
         ev = -100 # error value
         rv = {'x':ev, 'xbehind':ev, 'time':ev, \
@@ -69,7 +70,9 @@ class summarizerSingle(summarizer):
             # speeddecay is normalized by the bath speed
         rv['x'] = sli.iloc[0]['x']
         rv['xbehind'] = rv['x']-self.fs.geo.ncx
-        rv['time'] = np.float64(sli.iloc[0]['time'])
+        if agg is None:
+            agg = self.sliceAggregates(sli)
+        rv['time'] = np.float64(agg['time'])
 
         if len(sli)<10:
             #logging.error('Not enough points')
@@ -84,8 +87,8 @@ class summarizerSingle(summarizer):
         except:
             #logging.error('centroid error')
             raise ValueError('centroid error')
-        rv['maxheight'] = sli['z'].max()-sli['z'].min()
-        rv['maxwidth'] = sli['y'].max()-sli['y'].min()
+        rv['maxheight'] = agg['zmax']-agg['zmin']
+        rv['maxwidth'] = agg['ymax']-agg['ymin']
         if rv['maxheight']==0 or rv['maxwidth']==0:
             #logging.error('Cross-section is too small')
             raise ValueError('Cross-section is too small')
@@ -96,10 +99,10 @@ class summarizerSingle(summarizer):
         rv['maxheightn'] = rv['maxheight']/self.fs.geo.niw # normalize height by nozzle diameter
         rv['maxwidthn'] = rv['maxwidth']/self.fs.geo.niw # normalized width by intended width
 
-        rv['vertdisp'] = (sli['z'].min() - self.fs.geo.intentzbot)
+        rv['vertdisp'] = (agg['zmin'] - self.fs.geo.intentzbot)
         rv['vertdispn'] = rv['vertdisp']/self.fs.geo.niw
         rv['aspectratio'] = rv['maxheight']/rv['maxwidth']
-        rv['speed'] = sli['vx'].mean() # speed of interface points in x
+        rv['speed'] = agg['vxmean'] # speed of interface points in x
         rv['speeddecay'] = rv['speed']/self.fs.geo.bv # relative speed of interface relative to the bath speed
 
         return rv
\ No newline at end of file
@@ -11,6 +11,7 @@ import re
 from typing import List, Dict, Tuple, Union, Any
 import logging
 import traceback
+import multiprocessing
 
 # local packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -29,20 +30,34 @@ logger.setLevel(logging.DEBUG)
 
 #------------------------------------------------------
 
+def summaryRowTask(task:Tuple[str, float, float, str]) -> Tuple[dict, dict]:
+    '''get the summary row and units for one folder. task is (folder, time, xbehind, xunits), as described in superSummary. returns empty dictionaries if there is no slice'''
+    f, time, xbehind, xunits = task
+    fs = folderStats(f)
+    d,u = fs.metaRow()
+    fp = folderPoints(fs)
+    row, u2 = fp.importSummarySlice(time, xbehind, xunits)
+    if len(row)==0:
+        return {}, {}
+    return {**d, **dict(row.iloc[0])}, {**u, **u2}
+
 class superSummary:
-    '''given a time and position, collect slices from all of the folders and compile them into a single summary table'''
+    '''given a time and position, collect slices from all of the folders and compile them into a single summary table
+    processes is the number of processes to use to collect the slices, which are independent of each other'''
     
     def __init__(self, topFolder:Union[List[str], str]
                  , exportFolder:str
                  , time:float
                  , xbehind:float
                  , xunits:str='mm'
+                 , processes:int=1
                  , **kwargs):
         self.topFolder = topFolder
         self.exportFolder = exportFolder
         self.time = time
         self.xbehind = xbehind
         self.xunits = xunits
+        self.processes = processes
         self.fileName()
         
     def fileName(self) -> str:
@@ -57,25 +72,29 @@ class superSummary:
         else:
             self.getTable()
             
-    def addRow(self, f:str) -> None:
-        '''add the folder to the dataframe'''
-        fs = folderStats(f)
-        d,u = fs.metaRow()
-        fp = folderPoints(fs)
-        row, u2 = fp.importSummarySlice(self.time, self.xbehind, self.xunits)
-        if len(row)>0:
-            d = {**d, **dict(row.iloc[0])}
-            u = {**u, **u2}
+    def addResult(self, d:dict, u:dict) -> None:
+        '''add a row and units from summaryRowTask to the dataframe'''
+        if len(d)>0:
             self.rowlist.append(d)
             self.units = {**self.units, **u}
     
+    def addRow(self, f:str) -> None:
+        '''add the folder to the dataframe'''
+        self.addResult(*summaryRowTask((f, self.time, self.xbehind, self.xunits)))
+    
     def getTable(self):
         '''create the table by scraping data from folders'''
         flist = fh.simFolders(self.topFolder)
         self.rowlist = []
         self.units = {}
-        for f in flist:
-            self.addRow(f)
+        if self.processes>1 and len(flist)>1:
+            with multiprocessing.Pool(self.processes) as pool:
+                results = pool.map(summaryRowTask, [(f, self.time, self.xbehind, self.xunits) for f in flist])
+            for d,u in results:
+                self.addResult(d, u)
+        else:
+            for f in flist:
+                self.addRow(f)
         self.df = pd.DataFrame(self.rowlist)
         plainExp(self.fn, self.df, self.units)
         
\ No newline at end of file
@@ -15,13 +15,15 @@ import logging, platform, socket
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+HOSTNAME = socket.gethostname() # computer name, used in log file names and log records
+
 
 
 #----------------------------------------------
 
 def logFN(scriptFile:str) -> str:
     '''Get a log file name, given a script file name'''
-    compname = socket.gethostname()
+    compname = HOSTNAME
     base = os.path.splitext(os.path.basename(scriptFile))[0]
     dirpath = os.path.dirname(os.path.realpath(__file__))
     try:
@@ -29,8 +31,7 @@ def logFN(scriptFile:str) -> str:
     except:
         cfgbase = 'logs'
     logfolder = os.path.join(dirpath, cfgbase)
-    if not os.path.exists(logfolder):
-        os.mkdir(logfolder)
+    os.makedirs(logfolder, exist_ok=True)
 #         logfolder = os.path.join(os.path.dirname(dirpath), cfgbase)
 #         if not os.path.exists(logfolder):
 #             logfolder = dirpath
@@ -52,7 +53,7 @@ def openLog(f:str, LOGGERDEFINED:bool, level:str="INFO", exportLog:bool=True) ->
             logfile = logFN(f)
             filehandler = logging.FileHandler(logfile)
             filehandler.setLevel(loglevel)
-            formatter = logging.Formatter("%(asctime)s/{}/%(levelname)s: %(message)s".format(socket.gethostname()), datefmt='%b%d/%H:%M:%S')
+            formatter = logging.Formatter("%(asctime)s/{}/%(levelname)s: %(message)s".format(HOSTNAME), datefmt='%b%d/%H:%M:%S')
             filehandler.setFormatter(formatter)
             root.addHandler(filehandler)
             logging.info(f'Established log: {logfile}')